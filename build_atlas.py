@@ -0,0 +1,169 @@
+import os
+import json
+import hashlib
+from pathlib import Path
+from PIL import Image
+from paginate_content import write_pages
+from update_team import AVATAR_SIZE
+from content_merge import apply_sections
+
+# Configuration
+BASE_DIR = Path(os.getcwd())
+PORTAL_DIR = BASE_DIR / "portal"
+DATA_FILE = PORTAL_DIR / "site_content.json"
+SPRITES_DIR = PORTAL_DIR / "assets/sprites"
+MANIFEST_FILE = SPRITES_DIR / "manifest.json"
+
+SHEET_MAX = 2048  # max sheet width/height in pixels
+PADDING = 2       # gap between cells to avoid bleeding when scaled
+
+# Sprite groups: which images go in, and the largest cell edge for each
+GROUPS = {
+    "avatars": {
+        "max_size": AVATAR_SIZE,
+        "sources": lambda data: [m.get('image') for m in data.get('team', [])]
+    },
+    "logos": {
+        "max_size": 200,
+        "sources": lambda data: list(data.get('gallery', []))
+    }
+}
+
+def file_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+def sprite_coords(portal_dir=PORTAL_DIR):
+    """
+    {src: sprite coordinates} from the last atlas build, for sheets that still
+    exist, so other writers of 'assets' can keep the sprite fields.
+    """
+    portal_dir = Path(portal_dir)
+    manifest_file = portal_dir / MANIFEST_FILE.relative_to(PORTAL_DIR)
+    if not manifest_file.exists():
+        return {}
+    with open(manifest_file, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    return {src: c for entry in manifest.values() for src, c in entry['coords'].items()
+            if (portal_dir / c['sheet']).exists()}
+
+def shelf_pack(sizes):
+    """
+    Shelf bin-packing: place boxes tallest first, left to right, opening a
+    new shelf when a row is full and a new sheet when a sheet is full.
+    Returns [(sheet_index, x, y)] in input order and [(w, h)] per sheet.
+    """
+    order = sorted(range(len(sizes)), key=lambda i: -sizes[i][1])
+    placements = [None] * len(sizes)
+    sheets = []
+    sheet, x, y, shelf_h, used_w = 0, 0, 0, 0, 0
+
+    for i in order:
+        w, h = sizes[i]
+        if x + w > SHEET_MAX:
+            x, y, shelf_h = 0, y + shelf_h + PADDING, 0
+        if y + h > SHEET_MAX:
+            sheets.append((used_w, y - PADDING))
+            sheet, x, y, shelf_h, used_w = sheet + 1, 0, 0, 0, 0
+        placements[i] = (sheet, x, y)
+        x += w + PADDING
+        shelf_h = max(shelf_h, h)
+        used_w = max(used_w, x - PADDING)
+
+    if sizes:
+        sheets.append((used_w, y + shelf_h))
+    return placements, sheets
+
+def build_group(name, sources, max_size):
+    """Pack one group into sheets. Returns {src: sprite coordinates}."""
+    images = []
+    for src in sources:
+        with Image.open(PORTAL_DIR / src) as img:
+            img.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
+            images.append(img.convert('RGBA'))
+
+    placements, sheets = shelf_pack([img.size for img in images])
+    opaque = all(img.getextrema()[3][0] == 255 for img in images)
+    ext, save_format = ('.jpg', 'JPEG') if opaque else ('.png', 'PNG')
+
+    canvases = [Image.new('RGBA', size, (0, 0, 0, 0)) for size in sheets]
+    coords = {}
+    for src, img, (sheet, x, y) in zip(sources, images, placements):
+        canvases[sheet].paste(img, (x, y))
+        sw, sh = sheets[sheet]
+        coords[src] = {
+            "sheet": f"assets/sprites/{name}-{sheet}{ext}",
+            "x": x, "y": y, "w": img.width, "h": img.height,
+            "sheet_w": sw, "sheet_h": sh
+        }
+
+    for idx, canvas in enumerate(canvases):
+        dest = SPRITES_DIR / f"{name}-{idx}{ext}"
+        if save_format == 'JPEG':
+            canvas.convert('RGB').save(dest, save_format, quality=85, optimize=True)
+        else:
+            canvas.save(dest, save_format, optimize=True)
+        print(f"  Sheet {dest.name}: {canvas.width}x{canvas.height}")
+
+    return coords
+
+def main():
+    try:
+        with open(DATA_FILE, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        print(f"Error: {DATA_FILE} not found. Run reorganize_data.py first.")
+        return
+
+    os.makedirs(SPRITES_DIR, exist_ok=True)
+    manifest = {}
+    if MANIFEST_FILE.exists():
+        with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+
+    new_manifest = {}
+    for name, group in GROUPS.items():
+        sources = [s for s in group['sources'](data) if s and (PORTAL_DIR / s).exists()]
+        if not sources:
+            continue
+
+        # Rebuild only when an input image or the cell size changed
+        digest = hashlib.sha1(json.dumps(
+            [group['max_size']] + [(s, file_hash(PORTAL_DIR / s)) for s in sources]
+        ).encode()).hexdigest()
+
+        cached = manifest.get(name)
+        if cached and cached['hash'] == digest and all((PORTAL_DIR / c['sheet']).exists() for c in cached['coords'].values()):
+            print(f"Unchanged: {name} ({len(sources)} images)")
+            new_manifest[name] = cached
+            continue
+
+        print(f"Packing {name} ({len(sources)} images)...")
+        for old in SPRITES_DIR.glob(f"{name}-*"):
+            old.unlink()
+        new_manifest[name] = {"hash": digest, "coords": build_group(name, sources, group['max_size'])}
+
+    with open(MANIFEST_FILE, 'w', encoding='utf-8') as f:
+        json.dump(new_manifest, f, ensure_ascii=False, indent=2)
+    # Stylesheet written by earlier versions; nothing links it
+    (SPRITES_DIR / "sprites.css").unlink(missing_ok=True)
+
+    all_coords = {}
+    for entry in new_manifest.values():
+        all_coords.update(entry['coords'])
+
+    # Coordinates go beside each image's metadata; portal/app.js image() draws
+    # the cell from them, so no separate sprite stylesheet is generated
+    assets = data.get('assets', {})
+    for meta in assets.values():
+        meta.pop('sprite', None)
+    for src, c in all_coords.items():
+        assets.setdefault(src, {})['sprite'] = c
+
+    data, changed = apply_sections({'assets': assets}, DATA_FILE)
+    if changed:
+        write_pages(data)
+    print(f"Sprite coordinates written to {DATA_FILE}")
+
+if __name__ == "__main__":
+    main()
@@ -1,49 +1,111 @@
+import io
 import os
 import json
-import shutil
+import argparse
 from pathlib import Path
+from dataclasses import dataclass
 from PIL import Image
+from image_ops import placeholder, prescale, largest_frame, to_rgb, uses_alpha, fingerprint, palettize
+from near_dupes import near_duplicates
+from text_normalize import slide_text, save_cache
+from translation_memory import build_memory, translate_blocks, save_memory
+import text_normalize
+import translation_memory
+import catalog
+import pipeline
 
-# Configuration
-BASE_DIR = Path(os.getcwd())
-SOURCE_CN = BASE_DIR / "extracted_cn"
-SOURCE_EN = BASE_DIR / "extracted_en"
-PORTAL_DIR = BASE_DIR / "portal"
-ASSETS_DIR = PORTAL_DIR / "assets"
-IMAGES_DIR = ASSETS_DIR / "images"
-DATA_FILE = PORTAL_DIR / "data.json"
-
-# Ensure directories exist
-print(f"Checking source directory: {SOURCE_CN}")
-if not SOURCE_CN.exists():
-    print(f"Error: Source directory {SOURCE_CN} does not exist!")
-    exit(1)
-
-if os.path.exists(ASSETS_DIR):
-    try:
-        shutil.rmtree(ASSETS_DIR)
-    except Exception as e:
-        print(f"Warning: Could not clean assets dir: {e}")
-        
-os.makedirs(IMAGES_DIR, exist_ok=True)
+# Images are read, encoded and written concurrently within this memory ceiling
+MEMORY_LIMIT_MB = 256
+MAX_WIDTH = 1600
+
+@dataclass
+class BuildConfig:
+    """
+    Inputs and outputs of one build. Paths default to the usual layout under
+    base_dir (the working directory when the config is created), including
+    the text, translation and catalog caches in cache_dir.
+    """
+    base_dir: Path = None
+    source_cn: Path = None
+    source_en: Path = None
+    portal_dir: Path = None
+    cache_dir: Path = None
+    max_width: int = MAX_WIDTH
+    memory_limit_mb: int = MEMORY_LIMIT_MB
+
+    def __post_init__(self):
+        self.base_dir = Path(self.base_dir or os.getcwd())
+        self.source_cn = Path(self.source_cn or self.base_dir / "extracted_cn")
+        self.source_en = Path(self.source_en or self.base_dir / "extracted_en")
+        self.portal_dir = Path(self.portal_dir or self.base_dir / "portal")
+        self.cache_dir = Path(self.cache_dir or self.base_dir / ".cache")
+
+    @property
+    def images_dir(self):
+        return self.portal_dir / "assets/images"
+
+    @property
+    def data_file(self):
+        return self.portal_dir / "data.json"
+
+    @property
+    def roster_file(self):
+        return self.base_dir / "data/team.json"
+
+    @property
+    def site_content_file(self):
+        return self.portal_dir / "site_content.json"
+
+    @property
+    def content_dir(self):
+        return self.portal_dir / "content"
+
+    @property
+    def search_dir(self):
+        return self.portal_dir / "search"
+
+    def use_caches(self):
+        """Point the shared text, translation and catalog caches at this config."""
+        text_normalize.configure(self.cache_dir, self.base_dir)
+        translation_memory.configure(self.cache_dir, self.source_cn, self.source_en)
+        catalog.configure(self.cache_dir, self.base_dir)
 
-def optimize_image(src_path, dest_filename, max_width=1600):
+def encode(img, save_format):
+    buf = io.BytesIO()
+    if save_format == 'JPEG':
+        img.save(buf, save_format, quality=80, optimize=True)
+    else:
+        img.save(buf, save_format, optimize=True)
+    return buf.getvalue()
+
+def optimize_image(src_path, dest_filename, max_width=MAX_WIDTH, data=None):
     """
     Convert image to web-friendly format (JPG/PNG), resize if too large.
-    Returns the relative path for the web or None if failed.
+    Decodes data if given (the bytes of src_path), else reads src_path.
+    Returns (file name, encoded bytes, image metadata) or None if failed.
     """
     try:
-        with Image.open(src_path) as img:
-            # Convert TIFF or others to RGB for JPG
-            if img.mode in ('RGBA', 'P') and 'transparency' in img.info:
-                # Keep PNG for transparency
+        with Image.open(io.BytesIO(data) if data is not None else src_path) as img:
+            # Multi-page TIFFs: use the main (largest) page
+            img = largest_frame(img)
+
+            # Oversized sources are first decoded/reduced at a power-of-two scale
+            if img.width > max_width:
+                img = prescale(img, max_width / img.width)
+
+            if uses_alpha(img):
+                # Keep PNG for transparency; RGBA so palettize() keeps the alpha.
+                # Sources with an alpha channel that is fully opaque are flattened below
+                if img.mode != 'RGBA':
+                    img = img.convert('RGBA')
                 save_format = 'PNG'
                 ext = '.png'
-            elif img.mode != 'RGB':
-                img = img.convert('RGB')
-                save_format = 'JPEG'
-                ext = '.jpg'
             else:
+                # Opaque sources are downscaled in their own mode first, so the
+                # CMYK/16-bit conversion to RGB runs on the small image
+                if img.width > max_width and img.mode in ('RGB', 'CMYK', 'L'):
+                    img = img.resize((max_width, int(img.height * max_width / img.width)), Image.Resampling.LANCZOS)
+                img = to_rgb(img)
                 save_format = 'JPEG'
                 ext = '.jpg'
 
@@ -53,77 +115,165 @@ def optimize_image(src_path, dest_filename, max_width=1600):
                 new_height = int(img.height * ratio)
                 img = img.resize((max_width, new_height), Image.Resampling.LANCZOS)
 
-            final_filename = dest_filename + ext
-            dest_path = IMAGES_DIR / final_filename
-            
-            if save_format == 'JPEG':
-                img.save(dest_path, save_format, quality=80, optimize=True)
-            else:
-                img.save(dest_path, save_format, optimize=True)
+            # Low-quality placeholder from the resized image, before encoding
+            meta = placeholder(img)
+            # Perceptual hashes for near-duplicate detection (dropped before saving)
+            meta.update(fingerprint(img))
+
+            encoded = encode(img, save_format)
+
+            # Flat slide graphics: an indexed PNG avoids JPEG ringing and is far
+            # smaller than truecolor PNG; used whenever it is the smaller file
+            paletted = palettize(img)
+            if paletted is not None:
+                png = encode(paletted, 'PNG')
+                if len(png) < len(encoded):
+                    encoded, save_format, ext = png, 'PNG', '.png'
+
+            # Intrinsic size from the image we just encoded, so pages can reserve space
+            meta.update({
+                "width": img.width,
+                "height": img.height,
+                "bytes": len(encoded),
+                "format": save_format
+            })
                 
-            return f"assets/images/{final_filename}"
+            return dest_filename + ext, encoded, meta
     except Exception as e:
         print(f"Error processing image {src_path}: {e}")
         return None
 
-def read_text(path):
-    if not path.exists():
-        return ""
-    try:
-        with open(path, 'r', encoding='utf-8') as f:
-            return f.read().strip()
-    except Exception:
-        return ""
+def image_cost(image):
+    """Memory an image holds while in flight: its file plus decoded RGBA pixels and a resized copy."""
+    if image['width'] and image['height']:
+        return image['bytes'] + image['width'] * image['height'] * 4 * 2
+    return image['bytes'] * 10
+
+def process_images(images, config):
+    """
+    Optimize catalog image rows into config.images_dir through the overlapped
+    read/encode/write pipeline. Returns {md5: (web path, meta) or None}.
+    """
+    def source(image):
+        return catalog.BASE_DIR / image['path']
+
+    def read(image):
+        return source(image).read_bytes()
+
+    def process(image, data):
+        return optimize_image(source(image), image['dest'], config.max_width, data=data)
+
+    def write(image, result):
+        filename, data, meta = result
+        (config.images_dir / filename).write_bytes(data)
+        return f"assets/images/{filename}", meta
+
+    results, peak = pipeline.run(images, read, process, write, cost=image_cost,
+                                 memory_limit=config.memory_limit_mb * 1024 * 1024)
+    print(f"Optimized {len(images)} images (peak {peak / 1024 / 1024:.0f} MB of {config.memory_limit_mb} MB in flight)")
+    return {image['md5']: result for image, result in zip(images, results)}
+
+def remove_stale_images(slides_data, config):
+    """Delete slide images left by earlier builds; logos, avatars (kol/) and other assets are kept."""
+    current = {Path(path).name for slide in slides_data for path in slide['images']}
+    for path in config.images_dir.glob("slide_*"):
+        if path.is_file() and path.name not in current:
+            path.unlink()
+
+def collapse_near_duplicates(slides_data, portal_dir):
+    """
+    Replace images that are near-identical to a better variant elsewhere
+    (same logo or photo at another size or encoding) with that variant,
+    rewrite the slide references and delete the redundant files.
+    """
+    metas = {}
+    for slide in slides_data:
+        metas.update(slide['image_meta'])
+    replace = near_duplicates(metas)
+
+    for slide in slides_data:
+        images = []
+        for path in slide['images']:
+            path = replace.get(path, path)
+            if path not in images:
+                images.append(path)
+        slide['images'] = images
+        slide['image_meta'] = {p: metas[p] for p in images}
+
+    saved = 0
+    for path, keep in sorted(replace.items()):
+        dropped = portal_dir / path
+        saved += dropped.stat().st_size
+        dropped.unlink()
+        print(f"Near-duplicate: {path} -> {keep}")
+
+    for meta in metas.values():
+        for key in ('dhash', 'phash', 'flat'):
+            meta.pop(key, None)
+
+    print(f"Collapsed {len(replace)} near-duplicate images ({saved / 1024:.1f} KB)")
+
+def build_site(config=None):
+    """
+    Build portal/data.json and the optimized slide images from the extracted
+    decks. Safe to call repeatedly in one process. Returns the slide data,
+    or None if the CN deck has not been extracted.
+    """
+    config = config or BuildConfig()
+    config.use_caches()
+    print(f"Checking source directory: {config.source_cn}")
+    if not config.source_cn.exists():
+        print(f"Error: Source directory {config.source_cn} does not exist!")
+        return None
+    os.makedirs(config.images_dir, exist_ok=True)
 
-def main():
     slides_data = []
+
+    # Byte-identical sources (the same TIFF avatar or logo on several slides)
+    # are decoded and encoded once; later copies reuse the first output
+    unique = {}
+    slide_images = []
     
-    # Get all slide folders from CN (assuming CN covers all structure)
-    # Sort by slide number
-    slide_folders = sorted([d for d in SOURCE_CN.iterdir() if d.is_dir() and d.name.startswith('slide_')])
+    # Slides and their images come from the extraction catalog (CN covers all structure)
+    # Rescanned when a slide folder changed; unchanged files are not re-read
+    catalog.refresh_deck("cn", config.source_cn)
+    cn_slides = [s for s in catalog.slides("cn", config.source_cn) if s['name'].startswith('slide_')]
+
+    # The EN deck is not numbered like the CN deck; pair slides by content
+    alignment, pair_count = build_memory(config.source_cn, config.source_en)
+    print(f"Aligned {len(alignment)} slides with the EN deck ({pair_count} translation pairs)")
     
-    for folder in slide_folders:
-        slide_id = folder.name # e.g., slide_01
+    for slide in cn_slides:
+        slide_id = slide['name'] # e.g., slide_01
+        folder = config.source_cn / slide_id
         print(f"Processing {slide_id}...")
         
-        # 1. Read Texts
-        cn_text_path = folder / "texts" / "cn.txt"
-        en_text_path = SOURCE_EN / slide_id / "texts" / "en.txt" # Guessing filename
-        
-        # Fallback if en.txt name is different? User said "extracted_en" structure is similar.
-        # Let's check if en text file exists with slightly different name if exact match fails
-        if not en_text_path.exists():
-             # Try to find any txt file in that dir
-             en_text_dir = SOURCE_EN / slide_id / "texts"
-             if en_text_dir.exists():
-                 txts = list(en_text_dir.glob("*.txt"))
-                 if txts:
-                     en_text_path = txts[0]
-
-        cn_content = read_text(cn_text_path)
-        en_content = read_text(en_text_path)
+        # 1. Read Texts (normalized and cached by text_normalize)
+        cn_doc = slide_text(folder, "cn")
+        en_doc = slide_text(config.source_en / alignment[slide_id], "en") if slide_id in alignment else None
+
+        cn_content = cn_doc['text'] if cn_doc else ""
+        if en_doc:
+            en_content = en_doc['text']
+        else:
+            # CN-only slide: fill from the translation memory
+            en_content = translate_blocks(cn_doc['blocks']) if cn_doc else ""
         
-        # 2. Process Images
+        # 2. Collect Images
         # We will check extracted_cn images primarily.
         # If specific images are better in EN, we could merge, but usually they are identical visuals.
-        img_list = []
-        src_img_dir = folder / "images"
-        
-        if src_img_dir.exists():
-            # Sort images to maintain order
-            src_images = sorted([f for f in src_img_dir.iterdir() if f.is_file() and not f.name.startswith('.')])
-            
-            for idx, img_file in enumerate(src_images):
-                # Generate unique name: slide_01_0.jpg
-                dest_name = f"{slide_id}_{idx}"
-                web_path = optimize_image(img_file, dest_name)
-                if web_path:
-                    img_list.append(web_path)
+        # Images in file name order, with their content hash from the catalog
+        images = catalog.slide_images(slide['id'])
+        for idx, image in enumerate(images):
+            # Generate unique name: slide_01_0.jpg
+            unique.setdefault(image['md5'], dict(image, dest=f"{slide_id}_{idx}"))
+        slide_images.append(images)
         
         # Structure the data
         slide_entry = {
             "id": slide_id,
-            "images": img_list,
+            "images": [],
+            "image_meta": {},
             "content": {
                 "cn": cn_content,
                 "en": en_content
@@ -132,11 +282,41 @@ def main():
         
         slides_data.append(slide_entry)
 
+    # 3. Process Images: every distinct source once, reads/encodes/writes overlapped
+    processed = process_images(list(unique.values()), config)
+    for slide_entry, images in zip(slides_data, slide_images):
+        for image in images:
+            result = processed[image['md5']]
+            if result:
+                web_path, meta = result
+                slide_entry['images'].append(web_path)
+                slide_entry['image_meta'][web_path] = meta
+    reused = sum(len(images) for images in slide_images) - len(unique)
+
+    collapse_near_duplicates(slides_data, config.portal_dir)
+    remove_stale_images(slides_data, config)
+
+    save_cache()
+    save_memory()
+
     # Save JSON
-    with open(DATA_FILE, 'w', encoding='utf-8') as f:
+    with open(config.data_file, 'w', encoding='utf-8') as f:
         json.dump(slides_data, f, ensure_ascii=False, indent=2)
         
-    print(f"Done! Processed {len(slides_data)} slides. Data saved to {DATA_FILE}")
+    print(f"Done! Processed {len(slides_data)} slides ({reused} duplicate images reused). Data saved to {config.data_file}")
+    return slides_data
+
+def main():
+    parser = argparse.ArgumentParser(description="Build portal/data.json and slide images from the extracted decks")
+    parser.add_argument('--base-dir', type=Path, help="project directory (default: the working directory)")
+    parser.add_argument('--max-width', type=int, default=MAX_WIDTH, help="widest published image in pixels")
+    parser.add_argument('--memory-limit', type=int, default=MEMORY_LIMIT_MB, metavar='MB',
+                        help="ceiling for images in flight during optimization")
+    args = parser.parse_args()
+
+    config = BuildConfig(base_dir=args.base_dir, max_width=args.max_width, memory_limit_mb=args.memory_limit)
+    if build_site(config) is None:
+        exit(1)
 
 if __name__ == "__main__":
     main()
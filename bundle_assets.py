@@ -0,0 +1,241 @@
+import os
+import re
+import shutil
+import hashlib
+import argparse
+import urllib.request
+from pathlib import Path
+
+try:
+    import rjsmin
+except ImportError:
+    rjsmin = None
+
+try:
+    import rcssmin
+except ImportError:
+    rcssmin = None
+
+# Configuration
+BASE_DIR = Path(os.getcwd())
+PORTAL_DIR = BASE_DIR / "portal"
+VENDOR_DIR = BASE_DIR / "vendor"
+# sha256 of every vendored file ("<hex>  <name>" lines, as written by sha256sum).
+# Recorded with --pin after reviewing the downloads; commit it together with vendor/
+VENDOR_PINS = BASE_DIR / "vendor.sha256"
+
+# Third-party files served from our own origin instead: URL -> file in vendor/.
+# Only files matching their pinned hash are used; unpinned URLs are left alone.
+VENDOR = {
+    "https://unpkg.com/aos@2.3.1/dist/aos.css": "aos-2.3.1.css",
+    "https://unpkg.com/aos@2.3.1/dist/aos.js": "aos-2.3.1.js",
+    "https://www.transparenttextures.com/patterns/cubes.png": "cubes.png",
+}
+
+LINK_TAG = re.compile(r'[ \t]*<link\b[^>]*\brel="stylesheet"[^>]*>\n?')
+SCRIPT_TAG = re.compile(r'[ \t]*<script\b[^>]*\bsrc="([^"]+)"[^>]*>\s*</script>\n?')
+HREF = re.compile(r'\bhref="([^"]+)"')
+CSS_URL = re.compile(r'''url\(\s*["']?([^"')]+)["']?\s*\)''')
+
+class VendorError(Exception):
+    """A vendored file does not match its pinned sha256."""
+
+def load_pins():
+    pins = {}
+    if VENDOR_PINS.exists():
+        with open(VENDOR_PINS, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    digest, name = line.split(None, 1)
+                    pins[name.strip().lstrip('*')] = digest.lower()
+    return pins
+
+def download(url):
+    with urllib.request.urlopen(url, timeout=30) as response:
+        return response.read()
+
+def vendor_file(url):
+    """
+    Local copy of a VENDOR url, downloading it on first use. None if the URL
+    has no pinned hash or cannot be fetched; raises VendorError if the local
+    or downloaded bytes do not match the pin.
+    """
+    name = VENDOR[url]
+    pin = load_pins().get(name)
+    if pin is None:
+        print(f"Warning: no pinned sha256 for {url} in {VENDOR_PINS.name}; leaving it third-party")
+        return None
+
+    path = VENDOR_DIR / name
+    if path.exists():
+        data = path.read_bytes()
+    else:
+        try:
+            data = download(url)
+        except Exception as e:
+            print(f"Warning: could not vendor {url}: {e}")
+            return None
+
+    digest = hashlib.sha256(data).hexdigest()
+    if digest != pin:
+        raise VendorError(f"{url}: sha256 {digest} does not match the pinned {pin}")
+
+    if not path.exists():
+        VENDOR_DIR.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        print(f"Vendored {url} -> {path}")
+    return path
+
+def pin_vendor():
+    """Download every VENDOR url into vendor/ and record its sha256 in VENDOR_PINS."""
+    VENDOR_DIR.mkdir(parents=True, exist_ok=True)
+    lines = []
+    for url, name in VENDOR.items():
+        path = VENDOR_DIR / name
+        data = path.read_bytes() if path.exists() else download(url)
+        path.write_bytes(data)
+        lines.append(f"{hashlib.sha256(data).hexdigest()}  {name}\n")
+        print(f"Pinned {url} -> {path}")
+    with open(VENDOR_PINS, 'w', encoding='utf-8') as f:
+        f.writelines(lines)
+    print(f"Review the files in {VENDOR_DIR} and commit them with {VENDOR_PINS.name}")
+
+# Only token-aware minifiers are used; without them files are bundled as they
+# are, since regex passes break strings, url(...) values and regex literals
+def minify_css(css):
+    return rcssmin.cssmin(css) if rcssmin else css
+
+def minify_js(js):
+    return rjsmin.jsmin(js) if rjsmin else js
+
+def resolve(site_dir, ref):
+    """Local file for a tag reference (vendoring third-party URLs), or None to leave it alone."""
+    if ref in VENDOR:
+        return vendor_file(ref)
+    if '://' in ref or ref.startswith('//'):
+        return None
+    path = site_dir / ref
+    return path if path.exists() else None
+
+def vendor_css_urls(css, site_dir):
+    """Copy vendored url(...) targets into assets/vendor/ and point the CSS at them."""
+    def replace(match):
+        url = match.group(1)
+        if url not in VENDOR:
+            return match.group(0)
+        src = vendor_file(url)
+        if src is None:
+            return match.group(0)
+        dest = site_dir / "assets/vendor" / src.name
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(src, dest)
+        return f"url('assets/vendor/{src.name}')"
+    return CSS_URL.sub(replace, css)
+
+def write_bundle(site_dir, kind, content):
+    name = f"bundle.{hashlib.sha1(content.encode('utf-8')).hexdigest()[:10]}.{kind}"
+    with open(site_dir / name, 'w', encoding='utf-8') as f:
+        f.write(content)
+    return name
+
+def bundle(site_dir):
+    """
+    Replace the stylesheets and scripts index.html loads with one minified,
+    content-hashed CSS bundle and one JS bundle, vendoring third-party files.
+    Bundled local sources are removed from site_dir. Returns a report dict,
+    or None (index.html untouched) if a vendored file fails its hash check.
+    """
+    site_dir = Path(site_dir)
+    index = site_dir / "index.html"
+    with open(index, 'r', encoding='utf-8') as f:
+        html = f.read()
+
+    report = {"requests_before": 0, "requests_after": 0, "bytes_before": 0, "bytes_after": 0, "third_party": 0}
+    bundled = []
+
+    def collect(tags, ref_of):
+        """(tag, path) for each tag that can be bundled, in page order."""
+        found = []
+        for match in tags:
+            ref = ref_of(match)
+            report['requests_before'] += 1
+            if '://' in ref or ref.startswith('//'):
+                report['third_party'] += 1
+            path = resolve(site_dir, ref)
+            if path:
+                found.append((match.group(0), path))
+                report['bytes_before'] += path.stat().st_size
+            else:
+                report['requests_after'] += 1
+        return found
+
+    try:
+        css_tags = collect(LINK_TAG.finditer(html), lambda m: HREF.search(m.group(0)).group(1))
+        js_tags = collect(SCRIPT_TAG.finditer(html), lambda m: m.group(1))
+        sources = {}
+        for _, path in css_tags:
+            with open(path, 'r', encoding='utf-8') as f:
+                sources[path] = vendor_css_urls(f.read(), site_dir)
+    except VendorError as e:
+        print(f"Error: {e}")
+        return None
+
+    for tags, kind in ((css_tags, 'css'), (js_tags, 'js')):
+        if not tags:
+            continue
+        parts = []
+        for _, path in tags:
+            if kind == 'css':
+                parts.append(minify_css(sources[path]))
+            else:
+                with open(path, 'r', encoding='utf-8') as f:
+                    parts.append(minify_js(f.read()))
+        content = ('\n' if kind == 'css' else ';\n').join(parts)
+        name = write_bundle(site_dir, kind, content)
+
+        first_tag = tags[0][0]
+        indent = first_tag[:len(first_tag) - len(first_tag.lstrip())]
+        new_tag = (f'{indent}<link rel="stylesheet" href="{name}">\n' if kind == 'css'
+                   else f'{indent}<script src="{name}"></script>\n')
+        html = html.replace(first_tag, new_tag, 1)
+        for tag, _ in tags[1:]:
+            html = html.replace(tag, '', 1)
+
+        report['requests_after'] += 1
+        report['bytes_after'] += (site_dir / name).stat().st_size
+        bundled += [path for _, path in tags if path.is_relative_to(site_dir)]
+
+    with open(index, 'w', encoding='utf-8') as f:
+        f.write(html)
+
+    # The sources now live only inside the bundles
+    for path in bundled:
+        path.unlink()
+
+    print_report(report)
+    return report
+
+def print_report(report):
+    saved = report['bytes_before'] - report['bytes_after']
+    pct = f"{saved / report['bytes_before'] * 100:.0f}%" if report['bytes_before'] else "-"
+    print(f"Bundled CSS/JS: {report['requests_before']} requests ({report['third_party']} third-party) "
+          f"-> {report['requests_after']}, {report['bytes_before'] / 1024:.1f} KB -> "
+          f"{report['bytes_after'] / 1024:.1f} KB ({pct} smaller before compression)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Bundle and minify the CSS/JS of a built site directory in place")
+    parser.add_argument('site_dir', type=Path, nargs='?', help="site directory to rewrite (a copy, e.g. a publish staging dir)")
+    parser.add_argument('--pin', action='store_true', help=f"download the third-party files and record their sha256 in {VENDOR_PINS.name}")
+    args = parser.parse_args()
+    if args.pin:
+        pin_vendor()
+        return
+    if args.site_dir is None:
+        parser.error("site_dir is required")
+    if args.site_dir.resolve() == PORTAL_DIR.resolve():
+        print("Error: bundling rewrites index.html and deletes sources; run it on a copy, not portal/")
+        return
+    bundle(args.site_dir)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+import os
+import sys
+import sqlite3
+import hashlib
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+
+# Configuration
+BASE_DIR = Path(os.getcwd())
+CATALOG_FILE = BASE_DIR / ".cache/catalog.db"
+
+# Extraction outputs: deck name -> directory of slide_NN / page_NN folders
+DECKS = {
+    "cn": BASE_DIR / "extracted_cn",
+    "en": BASE_DIR / "extracted_en",
+    "named": BASE_DIR / "website_data_named",
+}
+SLIDE_PREFIXES = ('slide_', 'page_')
+
+# Hashing and header reads are I/O bound; threads overlap them
+SCAN_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+
+# Bump when SCHEMA changes; an older catalog is dropped and rebuilt (it is only a cache)
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS decks (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    root TEXT NOT NULL,
+    root_mtime INTEGER
+);
+CREATE TABLE IF NOT EXISTS slides (
+    id INTEGER PRIMARY KEY,
+    deck_id INTEGER NOT NULL REFERENCES decks(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    number INTEGER,
+    dir_mtimes TEXT,
+    UNIQUE (deck_id, name)
+);
+CREATE TABLE IF NOT EXISTS texts (
+    id INTEGER PRIMARY KEY,
+    slide_id INTEGER NOT NULL REFERENCES slides(id) ON DELETE CASCADE,
+    lang TEXT NOT NULL,
+    path TEXT NOT NULL,
+    bytes INTEGER,
+    chars INTEGER,
+    mtime INTEGER,
+    UNIQUE (slide_id, lang)
+);
+CREATE TABLE IF NOT EXISTS images (
+    id INTEGER PRIMARY KEY,
+    slide_id INTEGER NOT NULL REFERENCES slides(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    path TEXT NOT NULL,
+    md5 TEXT NOT NULL,
+    width INTEGER,
+    height INTEGER,
+    format TEXT,
+    bytes INTEGER,
+    mtime INTEGER,
+    UNIQUE (slide_id, name)
+);
+CREATE INDEX IF NOT EXISTS images_md5 ON images(md5);
+"""
+
+_conn = None
+
+def connect():
+    """Shared connection to CATALOG_FILE, creating the schema on first use."""
+    global _conn
+    if _conn is None:
+        CATALOG_FILE.parent.mkdir(parents=True, exist_ok=True)
+        _conn = sqlite3.connect(CATALOG_FILE)
+        _conn.row_factory = sqlite3.Row
+        _conn.execute("PRAGMA foreign_keys = ON")
+        if _conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            _conn.executescript("DROP TABLE IF EXISTS images; DROP TABLE IF EXISTS texts; "
+                                "DROP TABLE IF EXISTS slides; DROP TABLE IF EXISTS decks;")
+            _conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        _conn.executescript(SCHEMA)
+    return _conn
+
+def configure(cache_dir, base_dir):
+    """Use the catalog in cache_dir/catalog.db, with decks and paths relative to base_dir."""
+    global BASE_DIR, CATALOG_FILE, DECKS, _conn
+    catalog_file = Path(cache_dir) / "catalog.db"
+    if catalog_file != CATALOG_FILE or Path(base_dir) != BASE_DIR:
+        if _conn is not None:
+            _conn.close()
+        BASE_DIR, CATALOG_FILE, _conn = Path(base_dir), catalog_file, None
+        DECKS = {name: BASE_DIR / path.name for name, path in DECKS.items()}
+
+def relative(path):
+    path = Path(path).resolve()
+    try:
+        return path.relative_to(BASE_DIR.resolve()).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+def image_info(path):
+    """Content hash plus dimensions and format from the image header (no pixel decode)."""
+    with open(path, 'rb') as f:
+        md5 = hashlib.md5(f.read()).hexdigest()
+    try:
+        with Image.open(path) as img:
+            width, height, fmt = img.width, img.height, img.format
+    except Exception:
+        width = height = fmt = None
+    return {"md5": md5, "width": width, "height": height, "format": fmt}
+
+def entries(path):
+    """Visible entries of a directory, sorted by name ([] if it does not exist)."""
+    try:
+        with os.scandir(path) as it:
+            return sorted((e for e in it if not e.name.startswith('.')), key=lambda e: e.name)
+    except FileNotFoundError:
+        return []
+
+def dir_mtimes(slide_dir):
+    """
+    Modification times of a slide folder and its images/ and texts/ folders.
+    They change whenever a file is added, removed or renamed there (not when
+    one is rewritten in place, which catalog_deck() catches by file mtime).
+    """
+    mtimes = []
+    for path in (slide_dir, os.path.join(slide_dir, "images"), os.path.join(slide_dir, "texts")):
+        try:
+            mtimes.append(str(os.stat(path).st_mtime_ns))
+        except FileNotFoundError:
+            mtimes.append("-")
+    return ":".join(mtimes)
+
+def catalog_slide(conn, slide_id, slide_dir):
+    """
+    (Re)catalog one slide folder's texts and drop images and texts that are
+    gone. Returns (slide_id, dir entry, stat) for the images that are new or
+    changed (size or mtime); unchanged images are not re-hashed and unchanged
+    texts are not re-read.
+    """
+    conn.execute("UPDATE slides SET dir_mtimes = ? WHERE id = ?", (dir_mtimes(slide_dir), slide_id))
+    known = {row['name']: row for row in conn.execute("SELECT * FROM images WHERE slide_id = ?", (slide_id,))}
+
+    pending = []
+    for entry in entries(os.path.join(slide_dir, "images")):
+        if not entry.is_file():
+            continue
+        stat = entry.stat()
+        row = known.pop(entry.name, None)
+        if not (row and row['bytes'] == stat.st_size and row['mtime'] == stat.st_mtime_ns):
+            pending.append((slide_id, entry, stat))
+    conn.executemany("DELETE FROM images WHERE id = ?", [(row['id'],) for row in known.values()])
+
+    known = {row['lang']: row for row in conn.execute("SELECT * FROM texts WHERE slide_id = ?", (slide_id,))}
+    texts = []
+    for entry in entries(os.path.join(slide_dir, "texts")):
+        if not (entry.is_file() and entry.name.endswith('.txt')):
+            continue
+        stat = entry.stat()
+        row = known.pop(entry.name[:-4], None)
+        if row and row['bytes'] == stat.st_size and row['mtime'] == stat.st_mtime_ns:
+            continue
+        with open(entry.path, 'r', encoding='utf-8') as f:
+            chars = len(f.read())
+        texts.append((slide_id, entry.name[:-4], relative(entry.path), stat.st_size, chars, stat.st_mtime_ns))
+    conn.executemany("DELETE FROM texts WHERE id = ?", [(row['id'],) for row in known.values()])
+    conn.executemany("INSERT OR REPLACE INTO texts (slide_id, lang, path, bytes, chars, mtime) "
+                     "VALUES (?, ?, ?, ?, ?, ?)", texts)
+    return pending
+
+def catalog_deck(name, root=None):
+    """
+    Scan an extraction output directory into the catalog in one os.scandir
+    pass, hashing new images in a thread pool. Called by the extraction
+    scripts once they have written a deck. Returns the slide count.
+    """
+    conn = connect()
+    root = Path(root or DECKS[name])
+    if not root.exists():
+        print(f"Warning: deck directory {root} does not exist")
+        return 0
+
+    conn.execute("INSERT INTO decks (name, root) VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET root = excluded.root",
+                 (name, relative(root)))
+    deck_id = conn.execute("SELECT id FROM decks WHERE name = ?", (name,)).fetchone()['id']
+
+    names = []
+    pending = []
+    for entry in entries(root):
+        if not (entry.is_dir() and entry.name.startswith(SLIDE_PREFIXES)):
+            continue
+        number = entry.name.split('_')[-1]
+        conn.execute("INSERT OR IGNORE INTO slides (deck_id, name, number) VALUES (?, ?, ?)",
+                     (deck_id, entry.name, int(number) if number.isdigit() else None))
+        slide_id = conn.execute("SELECT id FROM slides WHERE deck_id = ? AND name = ?",
+                                (deck_id, entry.name)).fetchone()['id']
+        pending += catalog_slide(conn, slide_id, entry.path)
+        names.append(entry.name)
+
+    with ThreadPoolExecutor(SCAN_WORKERS) as pool:
+        infos = pool.map(image_info, [entry.path for _, entry, _ in pending])
+        conn.executemany(
+            "INSERT OR REPLACE INTO images (slide_id, name, path, md5, width, height, format, bytes, mtime) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [(slide_id, entry.name, relative(entry.path), info['md5'], info['width'], info['height'],
+              info['format'], stat.st_size, stat.st_mtime_ns)
+             for (slide_id, entry, stat), info in zip(pending, infos)])
+
+    conn.execute(f"DELETE FROM slides WHERE deck_id = ? AND name NOT IN ({','.join('?' * len(names))})",
+                 (deck_id, *names))
+    conn.execute("UPDATE decks SET root_mtime = ? WHERE id = ?", (root.stat().st_mtime_ns, deck_id))
+    conn.commit()
+    return len(names)
+
+def deck_changed(name, root):
+    """
+    Whether a cataloged deck may differ from its directory: checked with one
+    stat of the deck root and three per slide against the stored mtimes, so
+    an unchanged deck costs no directory listing and no file reads.
+    """
+    conn = connect()
+    row = conn.execute("SELECT id, root, root_mtime FROM decks WHERE name = ?", (name,)).fetchone()
+    if row is None or row['root'] != relative(root) or row['root_mtime'] != root.stat().st_mtime_ns:
+        return True
+    return any(slide['dir_mtimes'] != dir_mtimes(root / slide['name'])
+               for slide in conn.execute("SELECT name, dir_mtimes FROM slides WHERE deck_id = ?", (row['id'],)))
+
+def refresh_deck(name, root=None):
+    """
+    Rescan a deck before a build reads it if any of its folders changed, so
+    images and texts added, replaced or removed inside existing slides are
+    picked up. Files rewritten in place under the same name are only seen by
+    catalog_deck(), which the extraction scripts run after writing a deck.
+    A deck whose directory is gone is dropped from the catalog.
+    """
+    root = Path(root or DECKS[name])
+    if not root.exists():
+        connect().execute("DELETE FROM decks WHERE name = ?", (name,))
+        connect().commit()
+    elif deck_changed(name, root):
+        catalog_deck(name, root)
+
+def ensure_deck(name, root=None):
+    """
+    Catalog a deck that is missing from the catalog, was cataloged from a
+    different root, or whose directory was re-created since (e.g. extracted
+    before the catalog existed). Only the deck directory itself is checked;
+    callers that need changes inside slides call refresh_deck() first.
+    """
+    root = Path(root or DECKS[name])
+    conn = connect()
+    row = conn.execute("SELECT root, root_mtime FROM decks WHERE name = ?", (name,)).fetchone()
+    if not root.exists():
+        if row:
+            conn.execute("DELETE FROM decks WHERE name = ?", (name,))
+            conn.commit()
+    elif row is None or row['root'] != relative(root) or row['root_mtime'] != root.stat().st_mtime_ns:
+        catalog_deck(name, root)
+
+def slides(name, root=None):
+    """Slide rows (id, name, number) of a deck in folder order (root: its directory, if not the default)."""
+    ensure_deck(name, root)
+    return connect().execute(
+        "SELECT s.id, s.name, s.number FROM slides s JOIN decks d ON d.id = s.deck_id "
+        "WHERE d.name = ? ORDER BY s.name", (name,)).fetchall()
+
+def slide_images(slide_id):
+    """Image rows of one slide in file name order; path is relative to BASE_DIR."""
+    return connect().execute("SELECT * FROM images WHERE slide_id = ? ORDER BY name", (slide_id,)).fetchall()
+
+def deck_images(name):
+    """All image rows of a deck with their slide name, in slide and file name order."""
+    ensure_deck(name)
+    return connect().execute(
+        "SELECT s.name AS slide, i.* FROM images i JOIN slides s ON s.id = i.slide_id "
+        "JOIN decks d ON d.id = s.deck_id WHERE d.name = ? ORDER BY s.name, i.name", (name,)).fetchall()
+
+def deck_stats(name):
+    """Slide, image and text counts for a deck, and its slide with the most images."""
+    ensure_deck(name)
+    conn = connect()
+    row = conn.execute("""
+        SELECT COUNT(*) AS slides,
+               SUM(images > 0) AS slides_with_images,
+               SUM(images = 0) AS slides_without_images,
+               SUM(images) AS images,
+               SUM(texts) AS texts
+        FROM (SELECT s.id,
+                     (SELECT COUNT(*) FROM images i WHERE i.slide_id = s.id) AS images,
+                     (SELECT COUNT(*) FROM texts t WHERE t.slide_id = s.id) AS texts
+              FROM slides s JOIN decks d ON d.id = s.deck_id WHERE d.name = ?)
+    """, (name,)).fetchone()
+    stats = {key: row[key] or 0 for key in row.keys()}
+    busiest = conn.execute("""
+        SELECT s.name, COUNT(*) AS images FROM images i
+        JOIN slides s ON s.id = i.slide_id JOIN decks d ON d.id = s.deck_id
+        WHERE d.name = ? GROUP BY s.id ORDER BY images DESC, s.name LIMIT 1
+    """, (name,)).fetchone()
+    stats['busiest'] = (busiest['name'], busiest['images']) if busiest else None
+    return stats
+
+def main():
+    names = sys.argv[1:] or list(DECKS)
+    for name in names:
+        if name not in DECKS:
+            print(f"Error: unknown deck {name} (expected one of {', '.join(DECKS)})")
+            continue
+        count = catalog_deck(name)
+        print(f"Cataloged {name}: {count} slides from {DECKS[name]}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+import os
+import csv
+import json
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from translation_memory import translate
+
+try:
+    import fcntl
+except ImportError:  # Windows: atomic replace still applies, just no cross-process lock
+    fcntl = None
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+# Configuration
+BASE_DIR = Path(os.getcwd())
+ROSTER_FILE = BASE_DIR / "data/team.json"
+DATA_FILE = BASE_DIR / "portal/site_content.json"
+
+# Web path prefix of the avatars update_team.py publishes; their 'assets'
+# entries belong to update_team.py, every other entry to reorganize_data.py
+TEAM_ASSETS = "assets/images/kol/"
+
+# field -> (type, required)
+ROSTER_SCHEMA = {
+    "name": (str, True),
+    "role": (str, False),
+    "desc": (dict, True),
+    "twitter": (str, True),
+    "followers": (str, False),
+    "icon_name": (str, True),
+}
+
+def load_roster(path=ROSTER_FILE):
+    """
+    Load the team roster from JSON, CSV or YAML and validate it.
+    CSV uses desc_cn / desc_en columns for the bilingual description.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+
+    with open(path, 'r', encoding='utf-8') as f:
+        if suffix == '.json':
+            roster = json.load(f)
+        elif suffix == '.csv':
+            roster = []
+            for row in csv.DictReader(f):
+                desc = {"cn": row.pop('desc_cn', '')}
+                if row.get('desc_en'):
+                    desc['en'] = row['desc_en']
+                row.pop('desc_en', None)
+                roster.append({k: v for k, v in row.items() if v} | {"desc": desc})
+        elif suffix in ('.yaml', '.yml'):
+            if yaml is None:
+                raise ValueError(f"{path}: PyYAML is not installed")
+            roster = yaml.safe_load(f)
+        else:
+            raise ValueError(f"{path}: unsupported roster format '{suffix}'")
+
+    validate_roster(roster, path)
+    return roster
+
+def validate_roster(roster, source="roster"):
+    """Raise ValueError listing every schema problem in the roster."""
+    if not isinstance(roster, list):
+        raise ValueError(f"{source}: expected a list of members")
+
+    errors = []
+    seen = set()
+    for i, member in enumerate(roster):
+        where = f"{source}[{i}]"
+        if not isinstance(member, dict):
+            errors.append(f"{where}: expected an object")
+            continue
+        for field, (ftype, required) in ROSTER_SCHEMA.items():
+            if field not in member:
+                if required:
+                    errors.append(f"{where}: missing '{field}'")
+            elif not isinstance(member[field], ftype):
+                errors.append(f"{where}: '{field}' must be {ftype.__name__}")
+        for field in member:
+            if field not in ROSTER_SCHEMA:
+                errors.append(f"{where}: unknown field '{field}'")
+
+        desc = member.get('desc')
+        if isinstance(desc, dict) and not desc.get('cn'):
+            errors.append(f"{where}: 'desc' needs a 'cn' text")
+        if isinstance(member.get('twitter'), str) and not member['twitter'].startswith('https://'):
+            errors.append(f"{where}: 'twitter' must be an https URL")
+
+        key = member.get('icon_name')
+        if key in seen:
+            errors.append(f"{where}: duplicate icon_name '{key}'")
+        seen.add(key)
+
+    if errors:
+        raise ValueError("Invalid roster:\n  " + "\n  ".join(errors))
+
+def team_section(roster, images):
+    """
+    Build the site_content 'team' section; images maps icon_name -> web path.
+    Missing English descriptions come from the translation memory, else the Chinese.
+    """
+    return [{
+        "name": m['name'],
+        "role": m.get('role', 'Core Team'),
+        "desc": {
+            "cn": m['desc']['cn'],
+            "en": m['desc'].get('en') or translate(m['desc']['cn']) or m['desc']['cn']
+        },
+        "image": images.get(m['icon_name'], ''),
+        "twitter": m['twitter'],
+        "followers": m.get('followers', '')
+    } for m in roster]
+
+def write_json_atomic(path, obj, **dump_kwargs):
+    """
+    Write JSON to a temp file in the same directory, fsync, then rename over
+    the target, so readers only ever see the old or the new complete file.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(obj, f, ensure_ascii=False, **dump_kwargs)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates 0600 files; keep the published file readable by the web server
+        os.chmod(tmp, path.stat().st_mode & 0o777 if path.exists() else 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+@contextmanager
+def locked(path):
+    """Serialize read-modify-write cycles on path across processes."""
+    path = Path(path)
+    lock_path = path.parent / f".{path.name}.lock"
+    with open(lock_path, 'w') as lock:
+        if fcntl:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+def load_content(path=DATA_FILE):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+def merge_entries(old, new, owns=None):
+    """
+    Update a dict section key by key; dict entries are updated field by field.
+    Old keys that owns(key) accepts but new no longer has are dropped, so a
+    writer prunes its own stale entries without touching anyone else's.
+    """
+    merged = {key: value for key, value in old.items()
+              if key in new or not (owns and owns(key))}
+    for key, value in new.items():
+        if isinstance(value, dict) and isinstance(old.get(key), dict):
+            merged[key] = {**old[key], **value}
+        else:
+            merged[key] = value
+    return merged
+
+def diff_sections(current, updates, merge=(), owns=None):
+    """Names of the sections in updates that would change current."""
+    changed = []
+    for section, value in updates.items():
+        old = current.get(section)
+        if section in merge and isinstance(old, dict):
+            if merge_entries(old, value, owns) != old:
+                changed.append(section)
+        elif old != value:
+            changed.append(section)
+    return changed
+
+def apply_sections(updates, path=DATA_FILE, merge=(), owns=None):
+    """
+    Apply only the changed sections of updates to the JSON document at path,
+    under a lock and with an atomic replace. Sections listed in merge are
+    dicts that are updated entry by entry (see merge_entries) instead of
+    replaced; owns(key) picks the entries of those sections this writer
+    produces, which are removed when updates no longer has them.
+    Returns (document after the update, list of changed sections).
+    """
+    with locked(path):
+        current = load_content(path)
+        changed = diff_sections(current, updates, merge, owns)
+
+        for section in changed:
+            if section in merge:
+                current[section] = merge_entries(current.get(section, {}), updates[section], owns)
+            else:
+                current[section] = updates[section]
+
+        if changed:
+            write_json_atomic(path, current, indent=2)
+
+    return current, changed
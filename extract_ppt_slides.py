@@ -11,6 +11,7 @@ from pathlib import Path
 from pptx import Presentation
 from PIL import Image
 import io
+import catalog
 
 
 def get_image_hash(image_data):
@@ -115,6 +116,9 @@ def extract_slide_content(prs, output_base_dir, ppt_name):
         if image_counters[slide_idx] == 0:
             print(f"    本页无图片")
     
+    # 记录到提取目录索引（页面、文本、图片哈希和尺寸）
+    catalog.catalog_deck(lang, output_base)
+    
     print(f"\n{lang_name}PPT提取完成！共 {len(prs.slides)} 页")
     print(f"输出目录: {output_base_dir}")
 
@@ -11,6 +11,7 @@ from pptx.enum.shapes import MSO_SHAPE_TYPE
 from zipfile import ZipFile
 import shutil
 import re
+import catalog
 
 def extract_text_from_shape(shape):
     """从形状中提取文本"""
@@ -244,12 +245,10 @@ def organize_by_pages_with_named_images(en_data, cn_data):
         if i < en_data['total_slides']:
             en_slide = en_data['slides'][i]
             
-            # 保存文本
+            # 保存文本（文本块之间用空行分隔，与extract_ppt_slides.py一致）
             texts_file = page_dir / 'texts' / 'en.txt'
             with open(texts_file, 'w', encoding='utf-8') as f:
-                for idx, text in enumerate(en_slide['texts']):
-                    f.write(f"--- Text Block {idx+1} ---\n")
-                    f.write(text + "\n\n")
+                f.write('\n\n'.join(en_slide['texts']))
             
             # 复制重命名后的图片
             if 'images_renamed' in en_slide:
@@ -266,9 +265,7 @@ def organize_by_pages_with_named_images(en_data, cn_data):
             # 保存文本
             texts_file = page_dir / 'texts' / 'cn.txt'
             with open(texts_file, 'w', encoding='utf-8') as f:
-                for idx, text in enumerate(cn_slide['texts']):
-                    f.write(f"--- 文本块 {idx+1} ---\n")
-                    f.write(text + "\n\n")
+                f.write('\n\n'.join(cn_slide['texts']))
             
             # 复制重命名后的图片
             if 'images_renamed' in cn_slide:
@@ -280,6 +277,9 @@ def organize_by_pages_with_named_images(en_data, cn_data):
         
         print(f"  ✓ {page_dir}")
     
+    # 记录到提取目录索引
+    catalog.catalog_deck('named', pages_dir)
+    
     return pages_dir
 
 def main():
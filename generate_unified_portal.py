@@ -6,36 +6,31 @@
 
 import json
 from pathlib import Path
+from text_normalize import load_text, save_cache
+import catalog
 
 def load_all_pages():
     """加载所有页面数据"""
     pages_data = []
-    pages_dir = Path('website_data_named')  # 使用带名称的数据
+    pages_dir = catalog.DECKS['named']  # 使用带名称的数据（页面和图片列表来自提取目录索引）
     
-    for page_dir in sorted(pages_dir.glob('page_*')):
-        page_data = {'page_num': int(page_dir.name.split('_')[1])}
+    catalog.refresh_deck('named')  # 目录有变化时重新扫描，只重新读取新增或改动的文件
+    for page in catalog.slides('named'):
+        page_dir = pages_dir / page['name']
+        page_data = {'page_num': page['number']}
         
-        # 读取英文文本
-        en_file = page_dir / 'texts' / 'en.txt'
-        if en_file.exists():
-            with open(en_file, 'r', encoding='utf-8') as f:
-                page_data['en_content'] = f.read()
-        
-        # 读取中文文本
-        cn_file = page_dir / 'texts' / 'cn.txt'
-        if cn_file.exists():
-            with open(cn_file, 'r', encoding='utf-8') as f:
-                page_data['cn_content'] = f.read()
+        # 读取英文、中文文本（统一规范化，已去掉文本块分隔标记）
+        for lang in ('en', 'cn'):
+            doc = load_text(page_dir / 'texts' / f'{lang}.txt')
+            if doc:
+                page_data[f'{lang}_content'] = doc['text']
         
         # 获取图片（现在使用有意义的文件名）
-        images_dir = page_dir / 'images'
-        page_data['images'] = []
-        if images_dir.exists():
-            for img in sorted(images_dir.glob('*')):
-                page_data['images'].append(str(img.relative_to(page_dir)))  # 使用相对路径
+        page_data['images'] = [f"images/{img['name']}" for img in catalog.slide_images(page['id'])]  # 使用相对路径
         
         pages_data.append(page_data)
     
+    save_cache()
     return pages_data
 
 def extract_key_info(pages_data):
@@ -98,8 +93,8 @@ def generate_html(info):
     """生成HTML"""
     
     # 格式化关于文本
-    about_en = info['about']['en'].replace('--- Text Block', '').replace('---', '').strip() if info['about']['en'] else '3am Club is a community founded by crypto followers.'
-    about_cn = info['about']['cn'].replace('--- 文本块', '').replace('---', '').strip() if info['about']['cn'] else '3am Club是一个由加密爱好者创立的社区。'
+    about_en = info['about']['en'] or '3am Club is a community founded by crypto followers.'
+    about_cn = info['about']['cn'] or '3am Club是一个由加密爱好者创立的社区。'
     
     html = f'''<!DOCTYPE html>
 <html lang="zh-CN">
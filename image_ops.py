@@ -0,0 +1,235 @@
+import io
+import math
+import base64
+import numpy as np
+from PIL import Image
+
+try:
+    from PIL import ImageCms
+except ImportError:  # Pillow built without LittleCMS
+    ImageCms = None
+
+# Placeholder configuration: longest LQIP edge. Transparent images get a PNG
+# LQIP that keeps its alpha, so the portal's dark background shows through
+LQIP_SIZE = 20
+LQIP_QUALITY = 40
+
+# Perceptual hashes: 64-bit dHash from a 9x8 thumbnail, 64-bit pHash from the
+# low frequencies of a 32x32 DCT. Images flatter than FLAT_STD (grey levels)
+# hash to ~0 and are not compared.
+PHASH_SIZE = 32
+FLAT_STD = 4.0
+
+# Flat slide graphics: up to PALETTE_COLORS distinct colours are stored
+# exactly in an indexed PNG; up to PALETTE_MAX_COLORS (anti-aliased edges)
+# are quantized to an adaptive palette. Photos have far more colours.
+PALETTE_COLORS = 256
+PALETTE_MAX_COLORS = 4096
+PALETTE_DITHER = False
+
+# A reduced-scale decode stops once the image is within this factor of its
+# final size, leaving the last step to a high-quality LANCZOS resize
+REDUCING_GAP = 2.0
+
+def block_mean(arr, target_size):
+    """
+    Downsample an HxWxC array by averaging blocks so that neither side of the
+    result exceeds target_size pixels. Blocks are square except along a side
+    shorter than the block, which collapses to one pixel. Pure NumPy, no
+    per-pixel Python loop.
+    """
+    h, w = arr.shape[:2]
+    factor = max(1, math.ceil(max(h, w) / target_size))
+    fy, fx = min(factor, h), min(factor, w)
+    h_crop, w_crop = (h // fy) * fy, (w // fx) * fx
+    blocks = arr[:h_crop, :w_crop].reshape(h_crop // fy, fy, w_crop // fx, fx, -1)
+    return blocks.mean(axis=(1, 3))
+
+def dominant_color(pixels):
+    """
+    Most common colour among an Nx3 pixel array, bucketed at 4 bits per
+    channel; returns the mean of the winning bucket as #rrggbb.
+    """
+    q = pixels.astype(np.uint16) >> 4
+    keys = (q[:, 0] << 8) | (q[:, 1] << 4) | q[:, 2]
+    winner = np.bincount(keys, minlength=4096).argmax()
+    r, g, b = pixels[keys == winner].mean(axis=0).round().astype(int)
+    return f"#{r:02x}{g:02x}{b:02x}"
+
+def placeholder(img):
+    """
+    Tiny blurred preview for an already-open image.
+    Returns {"lqip": data URI of a JPEG at most 20px a side, "color": dominant #rrggbb}.
+    Images with transparent pixels get a PNG LQIP with alpha (colours averaged
+    weighted by alpha, so transparent areas do not darken the edges), the
+    dominant colour of their opaque part and "alpha": True.
+    """
+    if uses_alpha(img):
+        rgba = np.asarray(img.convert('RGBA'), dtype=np.float32)
+        alpha = rgba[..., 3:] / 255
+        tiny = block_mean(np.concatenate([rgba[..., :3] * alpha, alpha], axis=2), LQIP_SIZE)
+        coverage = tiny[..., 3:]
+        rgb = np.divide(tiny[..., :3], coverage, out=np.zeros_like(tiny[..., :3]), where=coverage > 0)
+
+        buf = io.BytesIO()
+        pixels = np.concatenate([rgb, coverage * 255], axis=2)
+        Image.fromarray(pixels.round().astype(np.uint8)).save(buf, 'PNG', optimize=True)
+
+        opaque = rgb[coverage[..., 0] >= 0.5]
+        return {
+            "lqip": "data:image/png;base64," + base64.b64encode(buf.getvalue()).decode('ascii'),
+            "color": dominant_color(opaque if len(opaque) else rgb.reshape(-1, 3)),
+            "alpha": True
+        }
+
+    if img.mode != 'RGB':
+        img = img.convert('RGB')
+    tiny = block_mean(np.asarray(img, dtype=np.float32), LQIP_SIZE)
+
+    buf = io.BytesIO()
+    Image.fromarray(tiny.round().astype(np.uint8)).save(buf, 'JPEG', quality=LQIP_QUALITY)
+
+    return {
+        "lqip": "data:image/jpeg;base64," + base64.b64encode(buf.getvalue()).decode('ascii'),
+        "color": dominant_color(tiny.reshape(-1, 3))
+    }
+
+def prescale(img, scale):
+    """
+    Cheap first stage of a downscale by scale (final size / current size).
+    JPEGs are decoded at 1/2, 1/4 or 1/8 resolution via draft mode, so the
+    full-size pixels are never materialised; other formats are shrunk by an
+    integer factor with Image.reduce. The result stays at least REDUCING_GAP
+    times the final size. Call before anything loads the pixels
+    (convert, resize, placeholder). Returns the image to continue with.
+    """
+    if scale * REDUCING_GAP >= 1:
+        return img
+
+    if img.format == 'JPEG':
+        img.draft(img.mode, (math.ceil(img.width * scale * REDUCING_GAP),
+                             math.ceil(img.height * scale * REDUCING_GAP)))
+        return img
+
+    factor = int(1 / (scale * REDUCING_GAP))
+    try:
+        return img.reduce(factor)
+    except ValueError:
+        # Modes reduce() does not support (e.g. palette) take the plain path
+        return img
+
+def largest_frame(img):
+    """Select the largest page of a multi-page image (e.g. a TIFF with thumbnails)."""
+    frames = getattr(img, 'n_frames', 1)
+    if frames > 1:
+        areas = []
+        for i in range(frames):
+            img.seek(i)
+            areas.append(img.width * img.height)
+        img.seek(areas.index(max(areas)))
+    return img
+
+def uses_alpha(img):
+    """
+    True if the image has transparent pixels: an alpha channel that is not
+    fully opaque, or a palette/RGB transparency key. Loads the pixels.
+    """
+    if img.mode in ('RGBA', 'LA', 'PA'):
+        return img.getchannel('A').getextrema()[0] < 255
+    return 'transparency' in img.info
+
+def to_rgb(img):
+    """
+    RGB copy of an image in any mode, with dedicated paths where the generic
+    convert('RGB') is wrong or wasteful: CMYK goes through the embedded ICC
+    profile when there is one, and 16/32-bit integer images are scaled to
+    8 bits instead of being clipped.
+    """
+    if img.mode == 'RGB':
+        return img
+
+    if img.mode == 'CMYK':
+        icc = img.info.get('icc_profile')
+        if icc and ImageCms:
+            try:
+                src = ImageCms.ImageCmsProfile(io.BytesIO(icc))
+                return ImageCms.profileToProfile(img, src, ImageCms.createProfile('sRGB'), outputMode='RGB')
+            except ImageCms.PyCMSError:
+                pass
+        return img.convert('RGB')
+
+    if img.mode.startswith('I'):
+        # Scale by the range actually used: 12-bit data in a 16-bit image
+        # would come out near black, and 32-bit values would wrap
+        arr = np.asarray(img).astype(np.float32)
+        peak = arr.max(initial=0)
+        if peak > 255:
+            arr = arr * 255 / peak
+        return Image.fromarray(np.clip(arr, 0, 255).round().astype(np.uint8)).convert('RGB')
+
+    return img.convert('RGB')
+
+def _dct_matrix(n):
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    m = np.cos(np.pi * (2 * i + 1) * k / (2 * n)) * np.sqrt(2 / n)
+    m[0] /= np.sqrt(2)
+    return m
+
+DCT = _dct_matrix(PHASH_SIZE)
+
+def bits_to_int(bits):
+    return int.from_bytes(np.packbits(bits.astype(np.uint8)).tobytes(), 'big')
+
+def fingerprint(img):
+    """
+    Perceptual hashes of an image: {"dhash", "phash", "flat"}.
+    Both hashes are ints; images whose hashes differ in a few bits look alike
+    regardless of resolution or encoding.
+    """
+    gray = img.convert('L')
+
+    small = np.asarray(gray.resize((9, 8), Image.Resampling.BOX), dtype=np.int16)
+    dhash = bits_to_int(small[:, 1:] > small[:, :-1])
+
+    pixels = np.asarray(gray.resize((PHASH_SIZE, PHASH_SIZE), Image.Resampling.BOX), dtype=np.float64)
+    low = (DCT @ pixels @ DCT.T)[:8, :8].ravel()
+    phash = bits_to_int(low > np.median(low[1:]))
+
+    return {"dhash": dhash, "phash": phash, "flat": bool(pixels.std() < FLAT_STD)}
+
+def hamming(a, b):
+    return bin(a ^ b).count('1')
+
+def palettize(img, dither=PALETTE_DITHER):
+    """
+    Indexed ('P') version of a flat RGB/RGBA graphic, keeping transparency,
+    or None when it has too many colours to benefit. Colours are counted
+    with NumPy; at most PALETTE_COLORS the conversion is lossless.
+    """
+    if img.mode not in ('RGB', 'RGBA'):
+        return None
+
+    arr = np.asarray(img)
+    pixels = arr.reshape(-1, arr.shape[2]).astype(np.uint32)
+    packed = pixels[:, 0] << 16 | pixels[:, 1] << 8 | pixels[:, 2]
+    if img.mode == 'RGBA':
+        packed = packed.astype(np.uint64) << 8 | pixels[:, 3]
+
+    colors, first, inverse = np.unique(packed, return_index=True, return_inverse=True)
+
+    if len(colors) <= PALETTE_COLORS:
+        # Exact: the palette is the image's own colours
+        indexed = Image.frombytes('P', img.size, inverse.astype(np.uint8).tobytes())
+        entries = arr.reshape(-1, arr.shape[2])[first]
+        indexed.putpalette(entries[:, :3].ravel().tolist())
+        if img.mode == 'RGBA' and entries[:, 3].min() < 255:
+            indexed.info['transparency'] = bytes(entries[:, 3].tolist())
+        return indexed
+
+    if len(colors) <= PALETTE_MAX_COLORS:
+        method = Image.Quantize.FASTOCTREE if img.mode == 'RGBA' else Image.Quantize.MEDIANCUT
+        return img.quantize(PALETTE_COLORS, method=method,
+                            dither=Image.Dither.FLOYDSTEINBERG if dither else Image.Dither.NONE)
+
+    return None
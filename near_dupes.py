@@ -0,0 +1,77 @@
+from image_ops import hamming
+
+# Two images are near-duplicates when their pHashes differ in at most
+# PHASH_RADIUS bits and their dHashes in at most DHASH_RADIUS bits
+PHASH_RADIUS = 6
+DHASH_RADIUS = 10
+
+# ... and their aspect ratios agree within this fraction
+MAX_ASPECT_DIFF = 0.05
+
+class BKTree:
+    """Burkhard-Keller tree over integer hashes for Hamming-radius queries."""
+
+    def __init__(self):
+        self.root = None
+
+    def add(self, key, item):
+        node = self.root
+        if node is None:
+            self.root = [key, item, {}]
+            return
+        while True:
+            dist = hamming(key, node[0])
+            child = node[2].get(dist)
+            if child is None:
+                node[2][dist] = [key, item, {}]
+                return
+            node = child
+
+    def search(self, key, radius):
+        """Items whose key is within radius of key."""
+        found = []
+        stack = [self.root] if self.root else []
+        while stack:
+            node_key, item, children = stack.pop()
+            dist = hamming(key, node_key)
+            if dist <= radius:
+                found.append(item)
+            # Triangle inequality: only subtrees at distance dist±radius can match
+            for d in range(dist - radius, dist + radius + 1):
+                if d in children:
+                    stack.append(children[d])
+        return found
+
+def quality(meta):
+    """Higher is better: more pixels, then more bytes (less compression)."""
+    return (meta['width'] * meta['height'], meta['bytes'])
+
+def near_duplicates(metas):
+    """
+    Group near-identical images. metas maps path -> image metadata carrying
+    fingerprint() fields plus width/height/bytes. Returns {path: canonical path}
+    for every image that should be replaced by a better variant.
+    """
+    tree = BKTree()
+    for path, meta in metas.items():
+        if not meta['flat']:
+            tree.add(meta['phash'], path)
+
+    replace = {}
+    canonical = set()
+    for path, meta in sorted(metas.items(), key=lambda kv: quality(kv[1]), reverse=True):
+        if meta['flat'] or path in replace:
+            continue
+        canonical.add(path)
+        aspect = meta['width'] / meta['height']
+        for other in tree.search(meta['phash'], PHASH_RADIUS):
+            if other in canonical or other in replace:
+                continue
+            o = metas[other]
+            # Sorted best-first, so an unclaimed match is never better than path
+            if quality(o) > quality(meta):
+                continue
+            if (hamming(meta['dhash'], o['dhash']) <= DHASH_RADIUS
+                    and abs(o['width'] / o['height'] - aspect) <= MAX_ASPECT_DIFF * aspect):
+                replace[other] = path
+    return replace
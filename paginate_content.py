@@ -0,0 +1,103 @@
+import os
+import re
+import json
+from pathlib import Path
+from content_merge import write_json_atomic
+
+# Configuration
+BASE_DIR = Path(os.getcwd())
+PORTAL_DIR = BASE_DIR / "portal"
+DATA_FILE = PORTAL_DIR / "site_content.json"
+CONTENT_DIR = PORTAL_DIR / "content"
+INDEX_FILE = CONTENT_DIR / "index.json"
+
+# Heavy sections are split into pages of this many items;
+# everything else stays inline in the index document.
+PAGED_SECTIONS = {
+    "team": 8,
+    "cases": 1,
+    "gallery": 24,
+}
+
+# File names of the pages written below; nothing else in content/ is swept
+PAGE_FILE = re.compile(rf"({'|'.join(map(re.escape, PAGED_SECTIONS))})-\d+\.json")
+
+def collect_refs(obj, refs=None):
+    """Collect every assets/... path referenced anywhere inside obj."""
+    if refs is None:
+        refs = set()
+    if isinstance(obj, str):
+        if obj.startswith('assets/'):
+            refs.add(obj)
+    elif isinstance(obj, dict):
+        for value in obj.values():
+            collect_refs(value, refs)
+    elif isinstance(obj, list):
+        for value in obj:
+            collect_refs(value, refs)
+    return refs
+
+def assets_for(obj, assets):
+    """Subset of the assets metadata map needed to render obj."""
+    return {p: assets[p] for p in sorted(collect_refs(obj)) if p in assets}
+
+def write_pages(site_content, content_dir=CONTENT_DIR):
+    """
+    Split the heavy sections of site_content into content/<section>-<n>.json
+    pages and write a small content/index.json that lists them.
+    """
+    content_dir = Path(content_dir)
+    os.makedirs(content_dir, exist_ok=True)
+
+    assets = site_content.get('assets', {})
+    index = {k: v for k, v in site_content.items() if k not in PAGED_SECTIONS and k != 'assets'}
+    # Placeholders ship with the page that shows the image, not all up front
+    index['assets'] = assets_for(index, assets)
+    index['paged'] = {}
+    written = set()
+
+    for section, page_size in PAGED_SECTIONS.items():
+        items = site_content.get(section) or []
+        pages = []
+
+        for start in range(0, len(items), page_size):
+            page_num = start // page_size + 1
+            filename = f"{section}-{page_num}.json"
+            page_items = items[start:start + page_size]
+            write_json_atomic(content_dir / filename, {
+                "section": section,
+                "page": page_num,
+                "items": page_items,
+                "assets": assets_for(page_items, assets)
+            }, separators=(',', ':'))
+            pages.append(f"content/{filename}")
+            written.add(filename)
+
+        index['paged'][section] = {
+            "total": len(items),
+            "page_size": page_size,
+            "pages": pages
+        }
+
+    # Index last: it only ever points at pages that are already complete
+    write_json_atomic(content_dir / INDEX_FILE.name, index, separators=(',', ':'))
+
+    # Drop pages left over from a previous, larger build
+    for old in content_dir.glob('*-*.json'):
+        if PAGE_FILE.fullmatch(old.name) and old.name not in written:
+            old.unlink()
+
+    print(f"Paged content written to {content_dir} ({len(written)} pages)")
+
+def main():
+    try:
+        with open(DATA_FILE, 'r', encoding='utf-8') as f:
+            site_content = json.load(f)
+    except FileNotFoundError:
+        print(f"Error: {DATA_FILE} not found. Run reorganize_data.py first.")
+        return
+
+    write_pages(site_content)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import os
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+# Default ceiling on bytes held by items in flight (source bytes plus decoded
+# pixels), sized for a small VPS such as the Apache host in DEPLOY.md
+MEMORY_LIMIT = 256 * 1024 * 1024
+
+# Items waiting between stages; small, so a slow stage holds back the reader
+QUEUE_SIZE = 4
+
+class MemoryBudget:
+    """
+    Bytes reserved by items in flight. acquire() waits until the item fits
+    under the limit; an item larger than the whole limit runs on its own.
+    """
+    def __init__(self, limit):
+        self.limit = limit
+        self.used = 0
+        self.peak = 0
+        self._cond = asyncio.Condition()
+
+    async def acquire(self, size):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.used == 0 or self.used + size <= self.limit)
+            self.used += size
+            self.peak = max(self.peak, self.used)
+
+    async def release(self, size):
+        async with self._cond:
+            self.used -= size
+            self._cond.notify_all()
+
+async def run_pipeline(items, read, process, write, cost=None, workers=None,
+                       memory_limit=MEMORY_LIMIT, queue_size=QUEUE_SIZE):
+    """
+    Run read -> process -> write over items with the stages overlapped:
+    read(item) and write(item, result) run on an I/O thread, process(item, data)
+    on a pool of `workers` threads (PIL and NumPy release the GIL while
+    decoding, resizing and encoding). Stages are joined by bounded queues and
+    an item's cost(item) bytes stay reserved from before its read until its
+    write completes, so at most memory_limit bytes are in flight.
+    Returns (write results in item order, peak reserved bytes); an item whose
+    stage raised gets None.
+    """
+    items = list(items)
+    workers = workers or os.cpu_count() or 1
+    cost = cost or (lambda item: 0)
+    loop = asyncio.get_running_loop()
+    budget = MemoryBudget(memory_limit)
+    to_process = asyncio.Queue(queue_size)
+    to_write = asyncio.Queue(queue_size)
+    results = [None] * len(items)
+
+    io_pool = ThreadPoolExecutor(max_workers=2)
+    cpu_pool = ThreadPoolExecutor(max_workers=workers)
+
+    async def stage(fn, pool, index, *args):
+        try:
+            return await loop.run_in_executor(pool, fn, *args)
+        except Exception as e:
+            print(f"Error in pipeline {fn.__name__} for {items[index]}: {e}")
+            return None
+
+    async def reader():
+        for index, item in enumerate(items):
+            size = cost(item)
+            await budget.acquire(size)
+            data = await stage(read, io_pool, index, item)
+            await to_process.put((index, size, data))
+        for _ in range(workers):
+            await to_process.put(None)
+
+    async def worker():
+        while (job := await to_process.get()) is not None:
+            index, size, data = job
+            result = None if data is None else await stage(process, cpu_pool, index, items[index], data)
+            await to_write.put((index, size, result))
+
+    async def writer():
+        while (job := await to_write.get()) is not None:
+            index, size, result = job
+            if result is not None:
+                results[index] = await stage(write, io_pool, index, items[index], result)
+            await budget.release(size)
+
+    try:
+        write_task = asyncio.create_task(writer())
+        await asyncio.gather(reader(), *(worker() for _ in range(workers)))
+        await to_write.put(None)
+        await write_task
+    finally:
+        io_pool.shutdown()
+        cpu_pool.shutdown()
+    return results, budget.peak
+
+def run(items, read, process, write, **options):
+    """Synchronous entry point for run_pipeline."""
+    return asyncio.run(run_pipeline(items, read, process, write, **options))
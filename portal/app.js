@@ -9,30 +9,248 @@ document.addEventListener('DOMContentLoaded', () => {
     const app = {
         data: null,
         lang: 'cn',
+        // Paged sections: name -> { items, pages, next, loading }
+        sections: {},
+        thumbnails: {},
+        // Prebuilt search shards: lang -> promise of { docs, terms, keys }
+        searchShards: {},
 
         async init() {
             try {
-                const response = await fetch('site_content.json');
-                this.data = await response.json();
+                await this.loadContent();
+                await this.loadThumbnails();
                 this.renderAll();
                 this.setupEvents();
+                this.setupSearch();
+                this.setupPaging();
             } catch (error) {
                 console.error('Failed to load site content:', error);
                 document.body.innerHTML = '<h1 style="text-align:center; margin-top:20vh">Loading Error. Please check console.</h1>';
             }
         },
 
+        async loadContent() {
+            // Small index first; team, cases and gallery are fetched page by page on scroll
+            try {
+                const response = await fetch('content/index.json');
+                if (!response.ok) throw new Error(response.statusText);
+                this.data = await response.json();
+                Object.entries(this.data.paged || {}).forEach(([name, info]) => {
+                    this.sections[name] = { items: [], pages: info.pages, next: 0, loading: false };
+                });
+            } catch (error) {
+                // No paged build available: fall back to the single full document
+                const response = await fetch('site_content.json');
+                this.data = await response.json();
+                ['team', 'cases', 'gallery'].forEach(name => {
+                    this.sections[name] = { items: this.data[name] || [], pages: [], next: 0, loading: false };
+                });
+            }
+        },
+
+        async loadThumbnails() {
+            // Slide previews are optional: the portal works without render_thumbnails.py output
+            try {
+                const response = await fetch('thumbnails.json');
+                if (response.ok) this.thumbnails = await response.json();
+            } catch (error) {
+                this.thumbnails = {};
+            }
+        },
+
+        async loadNextPage(name) {
+            const section = this.sections[name];
+            if (!section || section.loading || section.next >= section.pages.length) return false;
+            section.loading = true;
+            try {
+                const response = await fetch(section.pages[section.next]);
+                const page = await response.json();
+                section.items = section.items.concat(page.items);
+                this.data.assets = Object.assign(this.data.assets || {}, page.assets);
+                section.next += 1;
+            } finally {
+                section.loading = false;
+            }
+            return true;
+        },
+
+        setupPaging() {
+            const targets = {
+                team: ['team-grid', () => this.renderTeam()],
+                cases: ['cases-container', () => this.renderCases()],
+                gallery: ['gallery-grid', () => this.renderInvest()]
+            };
+            const pending = Object.keys(targets).filter(name => this.sections[name] && this.sections[name].pages.length);
+            if (pending.length === 0) return;
+
+            if (!('IntersectionObserver' in window)) {
+                pending.forEach(async name => {
+                    while (await this.loadNextPage(name)) targets[name][1]();
+                });
+                return;
+            }
+
+            const observer = new IntersectionObserver(entries => {
+                entries.forEach(async entry => {
+                    if (!entry.isIntersecting) return;
+                    const name = entry.target.dataset.section;
+                    if (!(await this.loadNextPage(name))) return;
+                    targets[name][1]();
+                    // Re-observe so a sentinel that is still on screen triggers the next page
+                    observer.unobserve(entry.target);
+                    const section = this.sections[name];
+                    if (section.next < section.pages.length) observer.observe(entry.target);
+                });
+            }, { rootMargin: '400px 0px' });
+
+            pending.forEach(name => {
+                const sentinel = document.createElement('div');
+                sentinel.dataset.section = name;
+                document.getElementById(targets[name][0]).after(sentinel);
+                observer.observe(sentinel);
+            });
+        },
+
+        loadSearchShard(lang) {
+            if (!this.searchShards[lang]) {
+                this.searchShards[lang] = fetch(`search/${lang}.json`)
+                    .then(response => {
+                        if (!response.ok) throw new Error(response.statusText);
+                        return response.json();
+                    })
+                    .then(shard => Object.assign(shard, { keys: Object.keys(shard.terms) }));
+            }
+            return this.searchShards[lang];
+        },
+
+        tokenize(text) {
+            // Same rules as search_index.py: CJK bigrams, lowercase alphanumeric runs
+            const tokens = [];
+            (text.toLowerCase().match(/[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+|[a-z0-9]+/g) || []).forEach(run => {
+                if (/[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]/.test(run)) {
+                    if (run.length === 1) tokens.push(run);
+                    for (let i = 0; i + 1 < run.length; i++) tokens.push(run.slice(i, i + 2));
+                } else if (run.length > 1) {
+                    tokens.push(run);
+                }
+            });
+            return tokens;
+        },
+
+        escape(text) {
+            return String(text).replace(/[&<>"]/g, c => ({ '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;' })[c]);
+        },
+
+        async runSearch() {
+            const input = document.getElementById('search-input');
+            const box = document.getElementById('search-results');
+            const query = input.value.trim();
+            const tokens = this.tokenize(query);
+            if (tokens.length === 0) {
+                box.hidden = true;
+                return;
+            }
+
+            const lang = this.lang;
+            let shard;
+            try {
+                shard = await this.loadSearchShard(lang);
+            } catch (error) {
+                console.error('Failed to load search index:', error);
+                delete this.searchShards[lang];
+                return;
+            }
+            // A newer query (or language) has superseded this one
+            if (input.value.trim() !== query || this.lang !== lang) return;
+
+            // Every token must match; the last one as a prefix so results appear while typing
+            const last = tokens.pop();
+            const postings = tokens.map(token => shard.terms[token] || []);
+            const prefixed = new Set();
+            shard.keys.forEach(key => {
+                if (key.startsWith(last)) shard.terms[key].forEach(id => prefixed.add(id));
+            });
+            postings.push([...prefixed]);
+
+            // Rarer terms weigh more
+            const hits = new Map();
+            postings.forEach(list => list.forEach(id => {
+                const hit = hits.get(id) || { matched: 0, score: 0 };
+                hit.matched += 1;
+                hit.score += 1 / list.length;
+                hits.set(id, hit);
+            }));
+            const results = [...hits.entries()]
+                .filter(([, hit]) => hit.matched === postings.length)
+                .sort((a, b) => b[1].score - a[1].score)
+                .slice(0, 8);
+
+            box.innerHTML = results.length ? results.map(([id]) => {
+                const doc = shard.docs[id];
+                const body = `<strong>${this.escape(doc.title)}</strong><span>${this.escape(doc.snippet)}</span>`;
+                return doc.section
+                    ? `<a class="search-result" href="#${doc.section}">${body}</a>`
+                    : `<div class="search-result">${body}</div>`;
+            }).join('') : `<div class="search-result"><span>${this.t({cn: '没有找到相关内容', en: 'No results'})}</span></div>`;
+            box.hidden = false;
+        },
+
+        setupSearch() {
+            const input = document.getElementById('search-input');
+            const box = document.getElementById('search-results');
+            // Fetch the shard as soon as the user shows intent, so the first keystroke is instant
+            input.addEventListener('focus', () => this.loadSearchShard(this.lang).catch(() => delete this.searchShards[this.lang]));
+            input.addEventListener('input', () => this.runSearch());
+            input.addEventListener('keydown', e => {
+                if (e.key === 'Escape') {
+                    input.value = '';
+                    box.hidden = true;
+                }
+            });
+            box.addEventListener('click', () => { box.hidden = true; });
+            document.addEventListener('click', e => {
+                if (!e.target.closest('.search-box')) box.hidden = true;
+            });
+        },
+
         t(obj) {
             if (!obj) return '';
             if (typeof obj === 'string') return obj;
             return obj[this.lang] || obj['cn'] || '';
         },
 
+        imgAttrs(src) {
+            // Intrinsic size reserves layout space; dominant colour + blurred preview
+            // are shown until the real image has loaded
+            const meta = (this.data.assets || {})[src];
+            if (!meta) return '';
+            const size = meta.width ? `width="${meta.width}" height="${meta.height}"` : '';
+            if (!meta.lqip) return size;
+            // Transparent images: no colour fill, the LQIP keeps its alpha over the dark page
+            const fill = meta.alpha ? '' : `${meta.color} `;
+            return `${size} style="background:${fill}url('${meta.lqip}') center/cover no-repeat" onload="this.style.background=''"`;
+        },
+
+        image(src, cls, alt, extra = '') {
+            // Small images packed into a sprite sheet are drawn from the sheet instead
+            const meta = (this.data.assets || {})[src];
+            const c = meta && meta.sprite;
+            if (!c) return `<img src="${src}" class="${cls}" alt="${alt}" ${extra} ${this.imgAttrs(src)}>`;
+            const posX = c.sheet_w === c.w ? 0 : c.x / (c.sheet_w - c.w) * 100;
+            const posY = c.sheet_h === c.h ? 0 : c.y / (c.sheet_h - c.h) * 100;
+            // The sheet is only fetched once the cell is near the viewport (see lazySprites)
+            const style = `--sheet:url('${c.sheet}');` +
+                `background-size:${c.sheet_w / c.w * 100}% ${c.sheet_h / c.h * 100}%;` +
+                `background-position:${posX}% ${posY}%;aspect-ratio:${c.w}/${c.h}`;
+            return `<span role="img" aria-label="${alt}" class="${cls} sprite" style="${style}"></span>`;
+        },
+
         setupEvents() {
             // Lang Toggle
             document.getElementById('lang-toggle').addEventListener('click', () => {
                 this.lang = this.lang === 'cn' ? 'en' : 'cn';
                 this.renderAll();
+                this.runSearch();
                 // Update button text
                 document.getElementById('lang-toggle').textContent = this.lang === 'cn' ? 'EN / 中文' : '中文 / EN';
             });
@@ -45,6 +263,7 @@ document.addEventListener('DOMContentLoaded', () => {
             this.renderServices();
             this.renderTeam();
             this.renderCases();
+            this.renderSlides();
             this.renderInvest();
             this.renderContact();
         },
@@ -68,6 +287,7 @@ document.addEventListener('DOMContentLoaded', () => {
                     'section.services': {cn: '我们的服务', en: 'Our Services'},
                     'section.team': {cn: '核心团队', en: 'Core Team'},
                     'section.cases': {cn: '成功案例', en: 'Success Stories'},
+                    'section.slides': {cn: '演示文稿预览', en: 'Deck Preview'},
                     'section.invest': {cn: '生态与投资', en: 'Ecosystem & Invest'},
                     'section.contact': {cn: '联系我们', en: 'Contact Us'}
                 };
@@ -75,6 +295,9 @@ document.addEventListener('DOMContentLoaded', () => {
                     el.textContent = this.t(dict[key]);
                 }
             });
+            document.querySelectorAll('[data-i18n-placeholder]').forEach(el => {
+                el.placeholder = this.t({cn: '搜索', en: 'Search'});
+            });
         },
 
         renderHero() {
@@ -119,12 +342,12 @@ document.addEventListener('DOMContentLoaded', () => {
         },
 
         renderTeam() {
-            const team = this.data.team;
+            const team = this.sections.team.items;
             const html = team.map(member => `
                 <div class="team-card">
                     <div class="team-img-wrapper">
                         <a href="${member.twitter}" target="_blank" class="team-link">
-                            ${member.image ? `<img src="${member.image}" class="team-img" alt="${member.name}">` : ''}
+                            ${member.image ? `${this.image(member.image, 'team-img', member.name)}` : ''}
                             <div class="team-overlay">
                                 <span class="twitter-icon">𝕏</span>
                             </div>
@@ -140,10 +363,11 @@ document.addEventListener('DOMContentLoaded', () => {
                 </div>
             `).join('');
             document.getElementById('team-grid').innerHTML = html;
+            this.lazySprites();
         },
 
         renderCases() {
-            const cases = this.data.cases;
+            const cases = this.sections.cases.items;
             const html = cases.map((c, index) => `
                 <div class="case-card" data-aos="fade-up">
                     <div class="case-content">
@@ -153,7 +377,7 @@ document.addEventListener('DOMContentLoaded', () => {
                         </div>
                         <div class="case-gallery">
                             ${c.images.slice(0, 4).map(img => `
-                                <img src="${img}" class="case-img" loading="lazy">
+                                <img src="${img}" class="case-img" loading="lazy" ${this.imgAttrs(img)}>
                             `).join('')}
                         </div>
                     </div>
@@ -162,13 +386,42 @@ document.addEventListener('DOMContentLoaded', () => {
             document.getElementById('cases-container').innerHTML = html;
         },
 
+        renderSlides() {
+            const slides = this.thumbnails[this.lang] || this.thumbnails.cn || [];
+            document.getElementById('slides').hidden = slides.length === 0;
+            const html = slides.map(slide => `
+                <img src="${slide.thumb}" class="slide-thumb" alt="${slide.id}" loading="lazy" width="${slide.width}" height="${slide.height}">
+            `).join('');
+            document.getElementById('slide-strip').innerHTML = html;
+        },
+
         renderInvest() {
-            const gallery = this.data.gallery;
+            const gallery = this.sections.gallery.items;
             if (!gallery || gallery.length === 0) return;
             const html = gallery.map(img => `
-                <img src="${img}" class="gallery-item" loading="lazy">
+                ${this.image(img, 'gallery-item', '', 'loading="lazy"')}
             `).join('');
             document.getElementById('gallery-grid').innerHTML = html;
+            this.lazySprites();
+        },
+
+        lazySprites() {
+            // Same effect as loading="lazy" on the <img> path: .visible sets the background sheet
+            const cells = document.querySelectorAll('.sprite:not(.visible)');
+            if (!('IntersectionObserver' in window)) {
+                cells.forEach(cell => cell.classList.add('visible'));
+                return;
+            }
+            if (!this.spriteObserver) {
+                this.spriteObserver = new IntersectionObserver(entries => {
+                    entries.forEach(entry => {
+                        if (!entry.isIntersecting) return;
+                        entry.target.classList.add('visible');
+                        this.spriteObserver.unobserve(entry.target);
+                    });
+                }, { rootMargin: '200px 0px' });
+            }
+            cells.forEach(cell => this.spriteObserver.observe(cell));
         },
 
         renderContact() {
@@ -0,0 +1,128 @@
+import os
+import gzip
+import argparse
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Configuration
+BASE_DIR = Path(os.getcwd())
+DEPLOY_CURRENT = BASE_DIR / "deploy/current"
+EXTENSIONS = {'.html', '.css', '.js', '.json'}
+MIN_SAVING = 0.05  # keep a variant only if it is at least 5% smaller
+
+HTACCESS = """# Generated by precompress.py: serve the .br/.gz variants written next to
+# each file instead of compressing on every request with mod_deflate.
+<IfModule mod_rewrite.c>
+    RewriteEngine On
+
+    # Directory requests ("/", "sub/") go to the variant of their index.html,
+    # before DirectoryIndex would hand out the uncompressed file
+    RewriteCond "%{HTTP:Accept-Encoding}" "br"
+    RewriteCond "%{REQUEST_FILENAME}/index.html.br" -s
+    RewriteRule "^(.*/)?$" "$1index.html.br" [QSA]
+
+    RewriteCond "%{HTTP:Accept-Encoding}" "gzip"
+    RewriteCond "%{REQUEST_FILENAME}/index.html.gz" -s
+    RewriteRule "^(.*/)?$" "$1index.html.gz" [QSA]
+
+    RewriteCond "%{HTTP:Accept-Encoding}" "br"
+    RewriteCond "%{REQUEST_FILENAME}\\.br" -s
+    RewriteRule "^(.*)\\.(html|css|js|json)$" "$1.$2.br" [QSA]
+
+    RewriteCond "%{HTTP:Accept-Encoding}" "gzip"
+    RewriteCond "%{REQUEST_FILENAME}\\.gz" -s
+    RewriteRule "^(.*)\\.(html|css|js|json)$" "$1.$2.gz" [QSA]
+
+    # Original content types, and keep mod_deflate off the variants
+    RewriteRule "\\.html\\.(br|gz)$" "-" [T=text/html,E=no-gzip:1,E=no-brotli:1]
+    RewriteRule "\\.css\\.(br|gz)$" "-" [T=text/css,E=no-gzip:1,E=no-brotli:1]
+    RewriteRule "\\.js\\.(br|gz)$" "-" [T=text/javascript,E=no-gzip:1,E=no-brotli:1]
+    RewriteRule "\\.json\\.(br|gz)$" "-" [T=application/json,E=no-gzip:1,E=no-brotli:1]
+</IfModule>
+
+<IfModule mod_headers.c>
+    <FilesMatch "\\.(html|css|js|json)\\.br$">
+        Header set Content-Encoding br
+        Header append Vary Accept-Encoding
+    </FilesMatch>
+    <FilesMatch "\\.(html|css|js|json)\\.gz$">
+        Header set Content-Encoding gzip
+        Header append Vary Accept-Encoding
+    </FilesMatch>
+    # Content-hashed bundles never change under the same name
+    <FilesMatch "^bundle\\.[0-9a-f]+\\.(css|js)(\\.br|\\.gz)?$">
+        Header set Cache-Control "public, max-age=31536000, immutable"
+    </FilesMatch>
+</IfModule>
+"""
+
+def compress_file(path):
+    """
+    Write maximum-effort .gz and .br variants of one file, skipping any
+    variant that does not save at least MIN_SAVING.
+    Returns (path, original size, gz size or None, br size or None).
+    """
+    data = path.read_bytes()
+    results = {}
+
+    variants = {'.gz': lambda d: gzip.compress(d, compresslevel=9, mtime=0)}
+    if brotli:
+        variants['.br'] = lambda d: brotli.compress(d, quality=11, mode=brotli.MODE_TEXT)
+
+    for ext, compress in variants.items():
+        target = path.with_name(path.name + ext)
+        packed = compress(data)
+        if len(packed) <= len(data) * (1 - MIN_SAVING):
+            target.write_bytes(packed)
+            results[ext] = len(packed)
+        elif target.exists():
+            target.unlink()
+
+    return path, len(data), results.get('.gz'), results.get('.br')
+
+def precompress(site_dir, workers=None):
+    """Precompress every text asset under site_dir and write its .htaccess."""
+    site_dir = Path(site_dir)
+    files = sorted(p for p in site_dir.rglob('*') if p.is_file() and p.suffix in EXTENSIONS)
+
+    if brotli is None:
+        print("Note: brotli is not installed (pip install brotli); writing .gz only")
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        rows = list(pool.map(compress_file, files))
+
+    with open(site_dir / ".htaccess", 'w', encoding='utf-8') as f:
+        f.write(HTACCESS)
+
+    print_table(site_dir, rows)
+    return rows
+
+def fmt(size):
+    return "-" if size is None else f"{size / 1024:.1f}K"
+
+def print_table(site_dir, rows):
+    print(f"{'File':<40} {'Original':>10} {'gzip':>10} {'brotli':>10} {'Best':>10} {'Saved':>7}")
+    total_orig = total_best = 0
+    for path, orig, gz, br in rows:
+        best = min(s for s in (orig, gz, br) if s is not None)
+        total_orig += orig
+        total_best += best
+        saved = f"{(1 - best / orig) * 100:.0f}%" if orig else "-"
+        print(f"{str(path.relative_to(site_dir)):<40} {fmt(orig):>10} {fmt(gz):>10} {fmt(br):>10} {fmt(best):>10} {saved:>7}")
+    if total_orig:
+        saved = f"{(1 - total_best / total_orig) * 100:.0f}%"
+        print(f"{'Total':<40} {fmt(total_orig):>10} {'':>10} {'':>10} {fmt(total_best):>10} {saved:>7}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Write .gz/.br variants and Apache config for a site directory")
+    parser.add_argument('site_dir', nargs='?', type=Path, default=DEPLOY_CURRENT)
+    args = parser.parse_args()
+    precompress(args.site_dir)
+
+if __name__ == "__main__":
+    main()
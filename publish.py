@@ -0,0 +1,159 @@
+import os
+import sys
+import time
+import shutil
+import argparse
+from pathlib import Path
+from verify_assets import verify, reachable
+from precompress import precompress
+from subset_fonts import use_local_fonts, loads_google_fonts
+from bundle_assets import bundle
+
+# Configuration
+BASE_DIR = Path(os.getcwd())
+SOURCE_DIR = BASE_DIR / "portal"
+DEPLOY_ROOT = BASE_DIR / "deploy"
+KEEP_RELEASES = 5
+
+# Build intermediates and caches never go live; en/ is the old static page
+# whose links point outside portal/ (the hand-copied mirror never had it)
+EXCLUDE = shutil.ignore_patterns('.*', 'manifest.json', 'data.json', 'en')
+
+# What the browser loads first; everything else must be reachable from these
+ENTRY_POINTS = ['index.html', 'site_content.json', 'content/index.json', 'fonts.css', 'thumbnails.json']
+
+def copy_release(source, dest):
+    """
+    Copy source to dest, keeping only the files under assets/ that are
+    reachable from ENTRY_POINTS. Returns (files dropped, bytes dropped, bytes kept).
+    """
+    source = source.resolve()
+    assets_dir = source / "assets"
+    keep = reachable(source, [e for e in ENTRY_POINTS if (source / e).exists()])
+    stats = {"dropped": 0, "dropped_bytes": 0, "kept_bytes": 0}
+
+    def ignore(dirpath, names):
+        ignored = set(EXCLUDE(dirpath, names))
+        here = Path(dirpath).resolve()
+        for name in names:
+            path = here / name
+            if name in ignored or not path.is_file():
+                continue
+            size = path.stat().st_size
+            if here.is_relative_to(assets_dir) and path not in keep:
+                ignored.add(name)
+                stats['dropped'] += 1
+                stats['dropped_bytes'] += size
+            else:
+                stats['kept_bytes'] += size
+        return ignored
+
+    shutil.copytree(source, dest, ignore=ignore)
+    return stats
+
+def releases(root):
+    releases_dir = root / "releases"
+    if not releases_dir.exists():
+        return []
+    return sorted(d for d in releases_dir.iterdir() if d.is_dir() and not d.name.startswith('.'))
+
+def current_release(root):
+    link = root / "current"
+    return (root / os.readlink(link)).resolve() if link.is_symlink() else None
+
+def switch_to(root, release_dir):
+    """Point root/current at release_dir with an atomic rename of a fresh symlink."""
+    tmp_link = root / ".current.tmp"
+    if tmp_link.is_symlink() or tmp_link.exists():
+        tmp_link.unlink()
+    os.symlink(os.path.relpath(release_dir, root), tmp_link)
+    os.replace(tmp_link, root / "current")
+
+def prune(root, keep):
+    live = current_release(root)
+    old = releases(root)[:-keep] if keep > 0 else []
+    for release_dir in old:
+        if release_dir.resolve() != live:
+            shutil.rmtree(release_dir)
+            print(f"Pruned old release {release_dir.name}")
+
+def publish(source=SOURCE_DIR, root=DEPLOY_ROOT, keep=KEEP_RELEASES, allow_google_fonts=False):
+    """
+    Copy source into a new versioned release, verify it, then make it live.
+    A release that would still load Google Fonts (no fonts.css from
+    subset_fonts.py) is refused unless allow_google_fonts.
+    Returns the release directory, or None if verification failed.
+    """
+    release_id = time.strftime('%Y%m%d-%H%M%S')
+    release_dir = root / "releases" / release_id
+    suffix = 1
+    while release_dir.exists():
+        release_dir = root / "releases" / f"{release_id}-{suffix}"
+        suffix += 1
+    release_id = release_dir.name
+    staging = root / "releases" / f".{release_id}.tmp"
+    os.makedirs(staging.parent, exist_ok=True)
+
+    print(f"Building release {release_id} from {source}...")
+    stats = copy_release(source, staging)
+    total = stats['dropped_bytes'] + stats['kept_bytes']
+    print(f"Tree-shaking dropped {stats['dropped']} unreferenced assets: "
+          f"{stats['dropped_bytes'] / 1024:.1f} KB of {total / 1024:.1f} KB eliminated, "
+          f"{stats['kept_bytes'] / 1024:.1f} KB deployed")
+
+    if use_local_fonts(staging):
+        print("Using self-hosted font subsets (fonts.css) instead of Google Fonts")
+    elif loads_google_fonts(staging) and not allow_google_fonts:
+        print(f"Error: release {release_id} would load Google Fonts; run subset_fonts.py "
+              "(or pass --allow-google-fonts)")
+        shutil.rmtree(staging)
+        return None
+    if bundle(staging) is None:
+        shutil.rmtree(staging)
+        return None
+
+    broken = verify(staging)['broken']
+    if broken:
+        print(f"Error: release {release_id} has {len(broken)} broken references:")
+        for item in broken:
+            print(f"  - {item['path']}: {item['problem']}")
+        shutil.rmtree(staging)
+        return None
+
+    precompress(staging)
+
+    os.rename(staging, release_dir)
+    switch_to(root, release_dir)
+    print(f"Live: {root / 'current'} -> {release_dir}")
+
+    prune(root, keep)
+    return release_dir
+
+def rollback(root=DEPLOY_ROOT):
+    """Point current at the release before the live one."""
+    live = current_release(root)
+    previous = [r for r in releases(root) if live is None or r.resolve() < live]
+    if not previous:
+        print("Error: no earlier release to roll back to")
+        return None
+    switch_to(root, previous[-1])
+    print(f"Rolled back: {root / 'current'} -> {previous[-1]}")
+    return previous[-1]
+
+def main():
+    parser = argparse.ArgumentParser(description="Publish portal/ as an atomic, versioned release")
+    parser.add_argument('--root', type=Path, default=DEPLOY_ROOT, help="deploy root holding releases/ and current")
+    parser.add_argument('--keep', type=int, default=KEEP_RELEASES, help="number of releases to keep")
+    parser.add_argument('--rollback', action='store_true', help="switch current back to the previous release")
+    parser.add_argument('--allow-google-fonts', action='store_true',
+                        help="publish even if the fonts are not self-hosted")
+    args = parser.parse_args()
+
+    if args.rollback:
+        ok = rollback(args.root)
+    else:
+        ok = publish(SOURCE_DIR, args.root, args.keep, args.allow_google_fonts)
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
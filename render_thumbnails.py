@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+不依赖Office套件，直接用Pillow根据形状位置、嵌入图片和文本框合成每页的低分辨率缩略图
+结果按幻灯片内容哈希缓存，供门户网站的预览条使用
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from pptx import Presentation
+from pptx.enum.dml import MSO_FILL
+from pptx.enum.shapes import MSO_SHAPE_TYPE
+from PIL import Image, ImageDraw, ImageFont
+
+# 配置
+BASE_DIR = Path(os.getcwd())
+DECKS = {
+    "cn": BASE_DIR / "3amClub2024.pptx",
+    "en": BASE_DIR / "3amClub EN.pptx",
+}
+THUMB_DIR = BASE_DIR / "portal/assets/thumbs"
+MANIFEST_FILE = THUMB_DIR / "manifest.json"
+INDEX_FILE = BASE_DIR / "portal/thumbnails.json"
+THUMB_WIDTH = 320
+DEFAULT_FONT_PT = 18
+EMU_PER_PT = 12700
+
+# 修改渲染逻辑时递增，使旧缓存失效
+RENDER_VERSION = 2
+
+# 组合内坐标到幻灯片坐标的变换 (sx, sy, dx, dy)：x' = x * sx + dx
+IDENTITY = (1.0, 1.0, 0.0, 0.0)
+
+# 按顺序尝试的字体，找不到时用灰色条代替文字
+FONT_CANDIDATES = [
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",
+    "/System/Library/Fonts/PingFang.ttc",
+    "C:/Windows/Fonts/msyh.ttc",
+]
+
+
+def color_hex(fill):
+    """读取纯色填充的颜色，非纯色时返回None"""
+    try:
+        if fill.type == MSO_FILL.SOLID:
+            return f"#{fill.fore_color.rgb}"
+    except Exception:
+        pass
+    return None
+
+
+def text_size_pt(shape):
+    """取文本框中最大的字号（磅）"""
+    size = None
+    for paragraph in shape.text_frame.paragraphs:
+        for run in paragraph.runs:
+            if run.font.size is not None:
+                size = max(size or 0, run.font.size.pt)
+    return size or DEFAULT_FONT_PT
+
+
+def group_transform(group, transform):
+    """
+    组合的子形状使用自己的坐标系（chOff/chExt），组合被移动或缩放后
+    映射到组合在上一级中的位置（off/ext）；与上一级的变换复合
+    """
+    xfrm = group._element.grpSpPr.xfrm
+    if xfrm is None or xfrm.chOff is None or xfrm.chExt is None or None in (group.left, group.top):
+        return transform
+    ch_x, ch_y = xfrm.chOff.x, xfrm.chOff.y
+    ch_w, ch_h = xfrm.chExt.cx, xfrm.chExt.cy
+    gx = group.width / ch_w if ch_w else 1.0
+    gy = group.height / ch_h if ch_h else 1.0
+    sx, sy, dx, dy = transform
+    return (sx * gx, sy * gy,
+            sx * (group.left - ch_x * gx) + dx,
+            sy * (group.top - ch_y * gy) + dy)
+
+
+def collect_shapes(shapes, out, images, transform=IDENTITY):
+    """
+    把形状转换为可序列化的绘制指令（图片、色块、文本），坐标换算为幻灯片坐标。
+    图片只记录内容哈希，字节存入images（哈希 -> 字节），不随指令传给工作进程
+    """
+    for shape in shapes:
+        if shape.shape_type == MSO_SHAPE_TYPE.GROUP:
+            collect_shapes(shape.shapes, out, images, group_transform(shape, transform))
+            continue
+
+        if None in (shape.left, shape.top, shape.width, shape.height):
+            continue
+        sx, sy, dx, dy = transform
+        box = [round(shape.left * sx + dx), round(shape.top * sy + dy),
+               round(shape.width * sx), round(shape.height * sy)]
+
+        if hasattr(shape, "image"):
+            try:
+                blob = shape.image.blob
+            except Exception:
+                continue
+            digest = hashlib.sha1(blob).hexdigest()
+            images[digest] = blob
+            out.append({"kind": "picture", "box": box, "image": digest})
+            continue
+
+        if hasattr(shape, "fill"):
+            color = color_hex(shape.fill)
+            if color:
+                out.append({"kind": "fill", "box": box, "color": color})
+
+        if shape.has_text_frame and shape.text_frame.text.strip():
+            out.append({
+                "kind": "text",
+                "box": box,
+                "text": shape.text_frame.text.strip(),
+                "size": text_size_pt(shape),
+            })
+
+
+def slide_spec(prs, slide, lang, slide_idx, images):
+    """提取一页幻灯片的绘制描述（可在进程间传递，图片字节放在images中）"""
+    shapes = []
+    collect_shapes(slide.shapes, shapes, images)
+
+    background = None
+    try:
+        background = color_hex(slide.background.fill)
+    except Exception:
+        pass
+
+    return {
+        "lang": lang,
+        "id": f"slide_{slide_idx:02d}",
+        "width": prs.slide_width,
+        "height": prs.slide_height,
+        "background": background,
+        "shapes": shapes,
+    }
+
+
+def spec_hash(spec):
+    """计算幻灯片内容哈希，图片按其字节的哈希参与计算"""
+    h = hashlib.sha1()
+    h.update(f"{RENDER_VERSION}:{THUMB_WIDTH}".encode())
+    for key in ("width", "height", "background"):
+        h.update(f"{key}={spec[key]};".encode())
+    for shape in spec["shapes"]:
+        h.update(json.dumps(shape, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+    return h.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def load_font(px):
+    """按像素大小加载字体（每个工作进程缓存一次）"""
+    for path in FONT_CANDIDATES:
+        if os.path.exists(path):
+            try:
+                return ImageFont.truetype(path, px)
+            except OSError:
+                continue
+    return None
+
+
+def wrap_text(text, font, max_width):
+    """按像素宽度逐字换行，同时适用于中英文"""
+    lines = []
+    for paragraph in text.split("\n"):
+        line = ""
+        for char in paragraph:
+            if line and font.getlength(line + char) > max_width:
+                lines.append(line)
+                line = char
+            else:
+                line += char
+        lines.append(line)
+    return lines
+
+
+def draw_text(draw, shape, box, scale):
+    x, y, w, h = box
+    px = max(1, round(shape["size"] * EMU_PER_PT * scale))
+    font = load_font(px) if px >= 6 else None
+
+    if font is None:
+        # 字太小或没有可用字体：用灰色条表示文字行
+        line_h = max(2, px)
+        lines = shape["text"].split("\n")
+        for i, line in enumerate(lines):
+            top = y + i * line_h * 1.5
+            if top + line_h > y + h:
+                break
+            bar_w = min(w, max(line_h, len(line) * px * 0.6))
+            draw.rectangle([x, top, x + bar_w, top + line_h - 1], fill=(150, 150, 150))
+        return
+
+    top = y
+    for line in wrap_text(shape["text"], font, w):
+        if top > y + h:
+            break
+        draw.text((x, top), line, font=font, fill=(40, 40, 40))
+        top += px * 1.2
+
+
+def render_slide(spec, dest_path, image_dir):
+    """在工作进程中渲染缩略图并保存；图片从image_dir/<哈希>读取"""
+    scale = THUMB_WIDTH / spec["width"]
+    size = (THUMB_WIDTH, max(1, round(spec["height"] * scale)))
+    canvas = Image.new("RGB", size, spec["background"] or "#ffffff")
+    draw = ImageDraw.Draw(canvas)
+
+    for shape in spec["shapes"]:
+        box = [round(v * scale) for v in shape["box"]]
+        x, y, w, h = box
+        if w <= 0 or h <= 0:
+            continue
+
+        if shape["kind"] == "fill":
+            draw.rectangle([x, y, x + w - 1, y + h - 1], fill=shape["color"])
+        elif shape["kind"] == "picture":
+            try:
+                with Image.open(Path(image_dir) / shape["image"]) as pic:
+                    # JPEG直接按目标尺寸降采样解码
+                    pic.draft("RGB", (w, h))
+                    pic = pic.convert("RGBA").resize((w, h), Image.Resampling.BILINEAR)
+                    canvas.paste(pic, (x, y), pic)
+            except Exception:
+                draw.rectangle([x, y, x + w - 1, y + h - 1], outline=(200, 200, 200))
+        elif shape["kind"] == "text":
+            draw_text(draw, shape, box, scale)
+
+    canvas.save(dest_path, "JPEG", quality=70, optimize=True)
+    return size
+
+
+def load_manifest():
+    if MANIFEST_FILE.exists():
+        try:
+            with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception:
+            pass
+    return {}
+
+
+def main():
+    print("=" * 60)
+    print("幻灯片缩略图生成")
+    print("=" * 60)
+
+    THUMB_DIR.mkdir(parents=True, exist_ok=True)
+    manifest = load_manifest()
+    new_manifest = {}
+    seen = set()
+    index = {}
+    jobs = []
+    images = {}
+
+    for lang, deck in DECKS.items():
+        if not deck.exists():
+            print(f"跳过: 找不到文件 {deck}")
+            continue
+
+        print(f"\n读取 {deck.name} ...")
+        prs = Presentation(str(deck))
+        index[lang] = []
+
+        for slide_idx, slide in enumerate(prs.slides, start=1):
+            spec = slide_spec(prs, slide, lang, slide_idx, images)
+            key = f"{lang}/{spec['id']}"
+            filename = f"{lang}_{spec['id']}.jpg"
+            digest = spec_hash(spec)
+            seen.add(key)
+
+            entry = {
+                "id": spec["id"],
+                "thumb": f"assets/thumbs/{filename}",
+            }
+            index[lang].append(entry)
+
+            cached = manifest.get(key)
+            if cached and cached["hash"] == digest and (THUMB_DIR / filename).exists():
+                entry["width"], entry["height"] = cached["size"]
+                new_manifest[key] = cached
+                continue
+
+            jobs.append((key, digest, entry, spec, THUMB_DIR / filename))
+
+    print(f"\n需要渲染 {len(jobs)} 页，其余命中缓存")
+
+    if jobs:
+        # 需要渲染的页面用到的图片各写出一次，工作进程按路径读取，不在进程间传递字节
+        with tempfile.TemporaryDirectory(prefix="thumbs-") as image_dir, ProcessPoolExecutor() as pool:
+            for digest in {s["image"] for job in jobs for s in job[3]["shapes"] if s["kind"] == "picture"}:
+                with open(os.path.join(image_dir, digest), 'wb') as f:
+                    f.write(images[digest])
+            futures = [(job, pool.submit(render_slide, job[3], job[4], image_dir)) for job in jobs]
+            for (key, digest, entry, _spec, dest), future in futures:
+                try:
+                    size = future.result()
+                except Exception as e:
+                    # 沿用上一次的缩略图；没有可用的旧图时从索引中去掉这一页
+                    cached = manifest.get(key)
+                    if cached and dest.exists():
+                        entry["width"], entry["height"] = cached["size"]
+                        new_manifest[key] = cached
+                        print(f"  渲染失败 {key}: {e}，保留旧缩略图")
+                    else:
+                        index[key.split("/")[0]].remove(entry)
+                        print(f"  渲染失败 {key}: {e}，已从索引中移除")
+                    continue
+                entry["width"], entry["height"] = size
+                new_manifest[key] = {"hash": digest, "size": list(size)}
+                print(f"  已渲染: {dest.name}")
+
+    # 清理已不存在的幻灯片缩略图
+    for key in set(manifest) - seen:
+        stale = THUMB_DIR / (key.replace("/", "_") + ".jpg")
+        if stale.exists():
+            stale.unlink()
+
+    with open(MANIFEST_FILE, 'w', encoding='utf-8') as f:
+        json.dump(new_manifest, f, ensure_ascii=False, indent=2)
+
+    with open(INDEX_FILE, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, indent=2)
+
+    print(f"\n缩略图索引已保存到: {INDEX_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,18 @@
 import json
 import re
-
-# Load raw data
-try:
-    with open('portal/data.json', 'r', encoding='utf-8') as f:
-        raw_data = json.load(f)
-except FileNotFoundError:
-    print("Error: portal/data.json not found. Run build_site.py first.")
-    exit(1)
+import argparse
+from pathlib import Path
+from paginate_content import write_pages, assets_for
+from content_merge import load_roster, team_section, apply_sections, TEAM_ASSETS
+from text_normalize import split_lines
+from stats_extract import stats_section
+from search_index import write_index
+from translation_memory import save_memory
+from build_site import BuildConfig
+from build_atlas import sprite_coords
+
+# Slides of the build being reorganized (portal/data.json), loaded by reorganize_data()
+raw_data = []
 
 # Helper to find slide by ID
 def get_slide(slide_id):
@@ -16,10 +21,9 @@ def get_slide(slide_id):
             return s
     return None
 
-# Helper to extract text lines excluding empty ones
+# Helper to extract text lines excluding empty ones (same rule as text_normalize)
 def get_lines(text):
-    if not text: return []
-    return [line.strip() for line in text.split('\n') if line.strip()]
+    return split_lines(text)
 
 def process_hero():
     s = get_slide('slide_01')
@@ -37,15 +41,15 @@ def process_hero():
 
 def process_about():
     s4 = get_slide('slide_04')
-    s6 = get_slide('slide_06') # Stats
     
-    # Extract stats manually based on known content
-    stats = [
-        {"value": "37k+", "label": {"cn": "推特粉丝", "en": "Twitter Followers"}},
-        {"value": "12k+", "label": {"cn": "Discord成员", "en": "Discord Members"}},
-        {"value": "100+", "label": {"cn": "KOL", "en": "KOLs"}},
-        {"value": "1M+", "label": {"cn": "辐射用户", "en": "Reach"}}
-    ]
+    # Figures are extracted from the slide text; these values are only used
+    # when a figure cannot be found there
+    stats = stats_section(raw_data, [
+        {"key": "twitter", "value": "37k+", "label": {"cn": "推特粉丝", "en": "Twitter Followers"}},
+        {"key": "discord", "value": "12k+", "label": {"cn": "Discord成员", "en": "Discord Members"}},
+        {"key": "kol", "value": "100+", "label": {"cn": "KOL", "en": "KOLs"}},
+        {"key": "reach", "value": "1M+", "label": {"cn": "辐射用户", "en": "Reach"}}
+    ])
 
     # Clean up About text (remove links for separate display if needed, but keeping simple for now)
     # Extract just the intro paragraphs
@@ -98,39 +102,16 @@ def process_services():
     ]
     return services
 
-def process_team():
-    s8 = get_slide('slide_08')
-    
-    # The text in slide 8 is a bit messy. 
-    # We will structure it manually based on the names visible in the text.
-    # To be safe and robust, we might just provide the list of names and let frontend render a grid of cards 
-    # mapping to the images (which are usually in order).
-    
-    # Images in slide 8 are KOL/Team images.
-    # Let's try to map them.
-    
-    members = [
-        {"name": "刘社长.eth", "role": "Founder", "desc": {"cn": "3amClub创始人，深耕Gamefi赛道", "en": "Founder of My 3am Club, GameFi expert"}},
-        {"name": "sanyi", "role": "Web3 KOL", "desc": {"cn": "多个Web3项目的大使、推动者", "en": "Ambassador of multiple Web3 projects"}},
-        {"name": "超级罗杰斯", "role": "Investor", "desc": {"cn": "15年+类金融行业投资者", "en": "15+ years in finance investing"}},
-        {"name": "暴躁的希爷", "role": "Core Member", "desc": {"cn": "社区核心成员", "en": "Core Community Member"}},
-        {"name": "雪球", "role": "Researcher", "desc": {"cn": "基金定投研究者", "en": "Funds investments researcher"}},
-        {"name": "lilili.eth", "role": "Core Member", "desc": {"cn": "Web3探寻者", "en": "Web3 Explorer"}},
-        {"name": "Calman", "role": "Growth", "desc": {"cn": "专注于Web3项目用户增长", "en": "Focus on user growth"}},
-        {"name": "zlexdl.eth", "role": "GameFi", "desc": {"cn": "链游领域专家", "en": "GameFi Specialist"}},
-        {"name": "charles", "role": "Tech Lead", "desc": {"cn": "3am Club技术总监", "en": "Technical Director"}},
-        {"name": "捡个大西瓜", "role": "Art Director", "desc": {"cn": "3am Club艺术总监", "en": "Art Director"}}
-    ]
-    
-    # Assign images linearly to members (careful about count matching)
-    team_images = s8['images']
-    for i, member in enumerate(members):
-        if i < len(team_images):
-            member['image'] = team_images[i]
-        else:
-            member['image'] = "" # Placeholder needed
-            
-    return members
+def process_team(config):
+    # The roster lives in data/team.json (shared with update_team.py);
+    # avatars are published to portal/assets/images/kol by update_team.py.
+    roster = load_roster(config.roster_file)
+    images = {
+        m['icon_name']: f"assets/images/kol/{m['icon_name']}"
+        for m in roster
+        if (config.images_dir / "kol" / m['icon_name']).exists()
+    }
+    return team_section(roster, images)
 
 def process_cases():
     # Aggregate case studies from slides 16-22
@@ -164,21 +145,68 @@ def process_contact():
         "bd": "@xiaoxiaozhangsm"
     }
 
-def main():
+def reorganize_data(config=None):
+    """
+    Turn the slides built by build_site into site_content.json, its paged
+    content/ and the search index. Returns False if there is no build yet.
+    """
+    global raw_data
+    config = config or BuildConfig()
+    config.use_caches()
+    try:
+        with open(config.data_file, 'r', encoding='utf-8') as f:
+            raw_data = json.load(f)
+    except FileNotFoundError:
+        print(f"Error: {config.data_file} not found. Run build_site.py first.")
+        return False
+
     site_content = {
         "hero": process_hero(),
         "about": process_about(),
         "services": process_services(),
-        "team": process_team(),
+        "team": process_team(config),
         "cases": process_cases(),
         "contact": process_contact(),
         "gallery": get_slide('slide_26')['images'] if get_slide('slide_26') else [] # Investment slide has many logos/images
     }
-    
-    with open('portal/site_content.json', 'w', encoding='utf-8') as f:
-        json.dump(site_content, f, ensure_ascii=False, indent=2)
-    
-    print("Successfully generated portal/site_content.json")
+
+    # Placeholder metadata recorded by build_site for every referenced image
+    image_meta = {}
+    for s in raw_data:
+        image_meta.update(s.get('image_meta', {}))
+    site_content['assets'] = assets_for(site_content, image_meta)
+    # Images packed by build_atlas.py keep their sheet coordinates
+    for src, c in sprite_coords(config.portal_dir).items():
+        if src in site_content['assets']:
+            site_content['assets'][src]['sprite'] = c
+
+    # Only changed sections are written, atomically, so a partial run never
+    # leaves a half-written site_content.json behind
+    save_memory()
+
+    # Slide images that are no longer referenced drop out of 'assets'; the
+    # avatar entries are update_team.py's
+    data, changed = apply_sections(site_content, config.site_content_file, merge=('assets',),
+                                   owns=lambda path: not path.startswith(TEAM_ASSETS))
+    if not changed:
+        print(f"{config.site_content_file} already up to date")
+        # Cheap, and restores a deleted or partly written content/
+        write_pages(data, config.content_dir)
+        return True
+
+    print(f"Successfully generated {config.site_content_file} ({', '.join(changed)})")
+
+    write_pages(data, config.content_dir)
+    write_index(data, raw_data, search_dir=config.search_dir)
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate portal/site_content.json from the build_site output")
+    parser.add_argument('--base-dir', type=Path, help="project directory (default: the working directory)")
+    args = parser.parse_args()
+
+    if not reorganize_data(BuildConfig(base_dir=args.base_dir)):
+        exit(1)
 
 if __name__ == "__main__":
     main()
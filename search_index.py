@@ -0,0 +1,112 @@
+import os
+import re
+import json
+from pathlib import Path
+from content_merge import write_json_atomic
+
+# Configuration
+BASE_DIR = Path(os.getcwd())
+PORTAL_DIR = BASE_DIR / "portal"
+RAW_FILE = PORTAL_DIR / "data.json"
+DATA_FILE = PORTAL_DIR / "site_content.json"
+SEARCH_DIR = PORTAL_DIR / "search"
+LANGS = ("cn", "en")
+SNIPPET_CHARS = 120
+
+# Portal section (element id in index.html) that shows each slide's content;
+# other slides are still searchable but have no place on the page to jump to
+SLIDE_SECTIONS = {
+    "slide_01": "hero",
+    "slide_04": "about",
+    "slide_06": "about",
+    "slide_08": "team",
+    "slide_14": "services",
+    "slide_16": "cases",
+    "slide_17": "cases",
+    "slide_20": "cases",
+    "slide_26": "invest",
+    "slide_29": "contact",
+}
+
+# Chinese is indexed as overlapping character bigrams (no word segmenter needed);
+# everything else as lowercase alphanumeric runs, without stemming.
+# portal/app.js tokenizes queries with the same rules.
+TOKEN = re.compile(r'[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+|[a-z0-9]+')
+CJK = re.compile(r'[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]')
+
+def tokenize(text):
+    tokens = []
+    for run in TOKEN.findall((text or '').lower()):
+        if CJK.match(run):
+            if len(run) == 1:
+                tokens.append(run)
+            else:
+                tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        elif len(run) > 1:
+            tokens.append(run)
+    return tokens
+
+def snippet(text):
+    text = ' '.join((text or '').split())
+    return text if len(text) <= SNIPPET_CHARS else text[:SNIPPET_CHARS] + '…'
+
+def documents(site_content, slides, lang):
+    """Searchable documents for one language: (title, section, text)."""
+    docs = []
+    for m in site_content.get('team', []):
+        desc = m['desc'].get(lang) or ''
+        docs.append((m['name'], "team", f"{m['name']}\n{desc}"))
+    for c in site_content.get('cases', []):
+        title = c['title'].get(lang) or c['title'].get('cn', '')
+        docs.append((title, "cases", f"{title}\n{c['desc'].get(lang) or ''}"))
+    for s in slides:
+        text = s.get('content', {}).get(lang) or ''
+        lines = [line.strip() for line in text.split('\n') if line.strip()]
+        if lines:
+            docs.append((lines[0], SLIDE_SECTIONS.get(s['id'], ''), text))
+    return docs
+
+def build_shard(docs):
+    """Inverted index {token: [doc ids]} plus the result metadata for each doc."""
+    terms = {}
+    for doc_id, (title, section, text) in enumerate(docs):
+        for token in set(tokenize(text)):
+            terms.setdefault(token, []).append(doc_id)
+    return {
+        "docs": [{"title": title, "section": section, "snippet": snippet(text)}
+                 for title, section, text in docs],
+        "terms": {token: terms[token] for token in sorted(terms)}
+    }
+
+def write_index(site_content, slides=None, search_dir=SEARCH_DIR, raw_file=RAW_FILE):
+    """
+    Write one prebuilt search shard per language to portal/search/<lang>.json.
+    slides defaults to the build_site output in raw_file.
+    """
+    search_dir = Path(search_dir)
+    if slides is None:
+        try:
+            with open(raw_file, 'r', encoding='utf-8') as f:
+                slides = json.load(f)
+        except FileNotFoundError:
+            slides = []
+
+    for lang in LANGS:
+        shard = build_shard(documents(site_content, slides, lang))
+        shard['lang'] = lang
+        write_json_atomic(search_dir / f"{lang}.json", shard, separators=(',', ':'))
+        size = (search_dir / f"{lang}.json").stat().st_size
+        print(f"Search index {lang}: {len(shard['docs'])} docs, {len(shard['terms'])} terms, {size / 1024:.1f} KB")
+
+def main():
+    try:
+        with open(DATA_FILE, 'r', encoding='utf-8') as f:
+            site_content = json.load(f)
+    except FileNotFoundError:
+        print(f"Error: {DATA_FILE} not found. Run reorganize_data.py first.")
+        return
+
+    write_index(site_content)
+
+if __name__ == "__main__":
+    main()
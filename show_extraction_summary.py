@@ -2,83 +2,175 @@
 # -*- coding: utf-8 -*-
 """
 显示PPT提取结果的统计信息
+
+每个 deck 先用 os.scandir 单次扫描登记到提取目录索引（新增或改动的图片在
+线程池中计算哈希、读取文件头中的尺寸和格式），再输出每个 deck 和每页的
+表格：字节数、格式分布、像素尺寸和重复图片。--json 输出完整报告，
+--history 把总量追加到历史记录，用于跟踪资源膨胀。
 """
 
-import os
-from pathlib import Path
+import sys
+import json
+import argparse
+from datetime import datetime
+import catalog
 
+DECKS = [("en", "英文"), ("cn", "中文"), ("named", "命名图片")]
+HISTORY_FILE = catalog.BASE_DIR / ".cache/extraction_history.jsonl"
+LARGEST_COUNT = 5
 
-def count_files_in_dir(dir_path):
-    """统计目录中的文件数量"""
-    if not os.path.exists(dir_path):
-        return 0
-    files = [f for f in os.listdir(dir_path) if os.path.isfile(os.path.join(dir_path, f))]
-    return len(files)
 
+def format_bytes(size):
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024 or unit == 'MB':
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
 
-def get_statistics(base_dir, lang_name):
-    """获取提取结果的统计信息"""
-    print(f"\n{lang_name}PPT ({base_dir})")
-    print("=" * 60)
-    
-    base_path = Path(base_dir)
-    if not base_path.exists():
-        print(f"错误: 目录 {base_dir} 不存在")
-        return
-    
-    # 统计所有slide文件夹
-    slide_dirs = sorted([d for d in base_path.iterdir() if d.is_dir() and d.name.startswith('slide_')])
-    
-    total_slides = len(slide_dirs)
-    slides_with_images = 0
-    slides_without_images = 0
-    total_images = 0
-    total_texts = 0
-    
-    for slide_dir in slide_dirs:
-        images_dir = slide_dir / "images"
-        texts_dir = slide_dir / "texts"
-        
-        image_count = count_files_in_dir(images_dir)
-        text_count = count_files_in_dir(texts_dir)
-        
-        if image_count > 0:
-            slides_with_images += 1
-            total_images += image_count
+
+def deck_report(deck):
+    """一个 deck 的统计：总量、格式分布、重复图片、最大的图片和每页明细"""
+    stats = catalog.deck_stats(deck)
+    images = catalog.deck_images(deck)
+
+    formats = {}
+    seen = {}
+    duplicate_files = duplicate_bytes = 0
+    slides = {s['name']: {"slide": s['name'], "images": 0, "bytes": 0, "max_size": None, "duplicates": 0}
+              for s in catalog.slides(deck)}
+
+    for img in images:
+        fmt = formats.setdefault(img['format'] or '?', {"count": 0, "bytes": 0})
+        fmt['count'] += 1
+        fmt['bytes'] += img['bytes']
+
+        slide = slides[img['slide']]
+        slide['images'] += 1
+        slide['bytes'] += img['bytes']
+        if img['width'] and (slide['max_size'] is None or
+                             img['width'] * img['height'] > slide['max_size'][0] * slide['max_size'][1]):
+            slide['max_size'] = [img['width'], img['height']]
+
+        # 同一内容第二次及以后出现的文件算作重复
+        if img['md5'] in seen:
+            duplicate_files += 1
+            duplicate_bytes += img['bytes']
+            slide['duplicates'] += 1
         else:
-            slides_without_images += 1
-        
-        if text_count > 0:
-            total_texts += text_count
-    
-    print(f"总页数: {total_slides}")
-    print(f"包含图片的页面: {slides_with_images}")
-    print(f"没有图片的页面: {slides_without_images}")
-    print(f"总图片数: {total_images}")
-    print(f"总文本文件数: {total_texts}")
-    
-    # 找出图片最多的页面
-    max_images = 0
-    max_images_slide = None
-    for slide_dir in slide_dirs:
-        images_dir = slide_dir / "images"
-        image_count = count_files_in_dir(images_dir)
-        if image_count > max_images:
-            max_images = image_count
-            max_images_slide = slide_dir.name
-    
-    if max_images > 0:
-        print(f"图片最多的页面: {max_images_slide} ({max_images}张图片)")
+            seen[img['md5']] = img['slide']
+
+    largest = sorted(images, key=lambda img: img['bytes'], reverse=True)[:LARGEST_COUNT]
+    return {
+        "root": str(catalog.DECKS[deck].name),
+        "slides": stats['slides'],
+        "slides_with_images": stats['slides_with_images'],
+        "slides_without_images": stats['slides_without_images'],
+        "images": stats['images'],
+        "texts": stats['texts'],
+        "bytes": sum(img['bytes'] for img in images),
+        "busiest": stats['busiest'],
+        "formats": dict(sorted(formats.items(), key=lambda item: -item[1]['bytes'])),
+        "duplicates": {"files": duplicate_files, "bytes": duplicate_bytes, "unique": len(seen)},
+        "largest": [{"slide": img['slide'], "name": img['name'], "bytes": img['bytes'],
+                     "size": [img['width'], img['height']]} for img in largest],
+        "per_slide": list(slides.values()),
+    }
+
+
+def print_deck(report, lang_name):
+    print(f"\n{lang_name}PPT ({report['root']})")
+    print("=" * 60)
+
+    print(f"总页数: {report['slides']}")
+    print(f"包含图片的页面: {report['slides_with_images']}")
+    print(f"没有图片的页面: {report['slides_without_images']}")
+    print(f"总图片数: {report['images']}")
+    print(f"总文本文件数: {report['texts']}")
+
+    # 图片最多的页面
+    if report['busiest']:
+        name, count = report['busiest']
+        print(f"图片最多的页面: {name} ({count}张图片)")
+
+    dup = report['duplicates']
+    print(f"图片总大小: {format_bytes(report['bytes'])}，不同图片 {dup['unique']} 张，"
+          f"重复 {dup['files']} 张 ({format_bytes(dup['bytes'])})")
+
+    print("\n格式        数量        大小")
+    for fmt, info in report['formats'].items():
+        print(f"{fmt:<10}{info['count']:>6}{format_bytes(info['bytes']):>12}")
+
+    print("\n最大的图片:")
+    for img in report['largest']:
+        size = f"{img['size'][0]}x{img['size'][1]}" if img['size'][0] else "?"
+        print(f"  {img['slide']}/{img['name']}  {format_bytes(img['bytes'])}  {size}")
+
+    print("\n页面          图片        大小    最大尺寸  重复")
+    for slide in report['per_slide']:
+        size = f"{slide['max_size'][0]}x{slide['max_size'][1]}" if slide['max_size'] else "-"
+        print(f"{slide['slide']:<12}{slide['images']:>6}{format_bytes(slide['bytes']):>12}"
+              f"{size:>12}{slide['duplicates']:>6}")
+
+
+def append_history(report):
+    """追加每个 deck 的总量，并打印与上一次记录相比的变化"""
+    previous = None
+    if HISTORY_FILE.exists():
+        with open(HISTORY_FILE, 'r', encoding='utf-8') as f:
+            lines = [line for line in f if line.strip()]
+        if lines:
+            previous = json.loads(lines[-1])
+
+    entry = {"generated_at": report['generated_at'],
+             "decks": {deck: {"images": d['images'], "bytes": d['bytes'], "duplicate_bytes": d['duplicates']['bytes']}
+                       for deck, d in report['decks'].items()}}
+    HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(HISTORY_FILE, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entry) + '\n')
+
+    if previous:
+        print(f"\n与 {previous['generated_at']} 相比:")
+        for deck, totals in entry['decks'].items():
+            before = previous['decks'].get(deck, {"images": 0, "bytes": 0})
+            print(f"  {deck}: 图片 {totals['images'] - before['images']:+d}，"
+                  f"大小 {(totals['bytes'] - before['bytes']) / 1024:+.1f} KB")
 
 
 def main():
+    parser = argparse.ArgumentParser(description="PPT提取结果统计报告")
+    parser.add_argument('--json', metavar='PATH', help="把完整报告写成JSON（- 表示标准输出）")
+    parser.add_argument('--history', action='store_true', help=f"把总量追加到 {HISTORY_FILE.name}")
+    args = parser.parse_args()
+
+    report = {"generated_at": datetime.now().isoformat(timespec='seconds'), "decks": {}}
+    for deck, lang_name in DECKS:
+        if not catalog.DECKS[deck].exists():
+            if deck != "named":
+                # 诊断信息写到标准错误，--json - 的输出保持为合法JSON
+                print(f"错误: 目录 {catalog.DECKS[deck].name} 不存在", file=sys.stderr)
+            continue
+        # 单次扫描，只重新读取新增或改动的图片
+        catalog.catalog_deck(deck)
+        report['decks'][deck] = deck_report(deck)
+
+    if args.json == '-':
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return
+
     print("=" * 60)
     print("PPT内容提取统计")
     print("=" * 60)
-    
-    get_statistics("extracted_en", "英文")
-    get_statistics("extracted_cn", "中文")
-    
+
+    for deck, lang_name in DECKS:
+        if deck in report['decks']:
+            print_deck(report['decks'][deck], lang_name)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\nJSON报告: {args.json}")
+    if args.history:
+        append_history(report)
+
     print("\n" + "=" * 60)
     print("统计完成！")
     print("=" * 60)
@@ -86,4 +178,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
@@ -0,0 +1,143 @@
+import re
+import json
+from bisect import bisect_right
+from collections import Counter
+
+# Headline figure -> display label and the words that identify it in slide text
+STATS = {
+    "twitter": {"label": {"cn": "推特粉丝", "en": "Twitter Followers"}, "keywords": ("官推", "推特", "twitter", "followers")},
+    "discord": {"label": {"cn": "Discord成员", "en": "Discord Members"}, "keywords": ("discord",)},
+    "kol": {"label": {"cn": "KOL", "en": "KOLs"}, "keywords": ("kol",)},
+    "reach": {"label": {"cn": "辐射用户", "en": "Reach"}, "keywords": ("辐射", "曝光", "reach", "exposure")},
+}
+
+# Recognised so that e.g. "WeChat Group: / Members: 3000+" is not credited to another stat
+OTHER_KEYWORDS = ("wechat", "微信", "telegram", "电报")
+
+UNITS = {"k": 1_000, "m": 1_000_000, "万": 10_000, "百万": 1_000_000, "千万": 10_000_000, "亿": 100_000_000}
+
+# Headline figures are written as lower bounds: "37000+", "12k+", "100多位",
+# "50余名", "more than 50", "超百万", "达百万". Plain numbers (years, IDs, prices) are ignored.
+FIGURE = re.compile(r'''
+    (?P<prefix>超过|超|近|达|more\ than\s+|over\s+)?
+    (?:
+        (?P<num>\d[\d,]*(?:\.\d+)?)\s*(?P<unit>[kKmM](?![A-Za-z])|千万|百万|万|亿)?
+      | (?P<word>千万|百万)
+    )
+    (?P<suffix>\s*\+|多|余)?
+    (?![\dA-Za-z])
+''', re.VERBOSE)
+
+# Clause boundaries; a comma followed by a digit is a thousands separator
+CLAUSE = re.compile(r'[，。；;、！!？?]|,(?!\d)')
+
+# A label repeated this often on one slide is a per-person list ("Twitter Followers: 75k+"
+# under each KOL), not a community-wide figure
+LIST_REPEAT = 3
+
+LOOKBACK_LINES = 2
+
+def to_count(match):
+    """Integer value of a FIGURE match."""
+    if match['word']:
+        return UNITS[match['word']]
+    value = float(match['num'].replace(',', ''))
+    unit = match['unit']
+    if unit:
+        value *= UNITS[unit.lower()]
+    return int(value)
+
+def format_count(n):
+    """37000 -> '37k+', 1000000 -> '1M+', 100 -> '100+'."""
+    if n >= 1_000_000:
+        return f"{round(n / 1_000_000, 1):g}M+"
+    if n >= 1_000:
+        return f"{round(n / 1_000, 1):g}k+"
+    return f"{n}+"
+
+def classify(text):
+    """Stat key named in text, '' for a known non-stat platform, or None."""
+    lowered = text.lower()
+    for key, spec in STATS.items():
+        if any(k in lowered for k in spec['keywords']):
+            return key
+    if any(k in lowered for k in OTHER_KEYWORDS):
+        return ''
+    return None
+
+def clause_at(line, start, end):
+    """The clause of line containing line[start:end]."""
+    left = max((m.end() for m in CLAUSE.finditer(line, 0, start)), default=0)
+    right = CLAUSE.search(line, end)
+    return line[left:right.start() if right else len(line)]
+
+def extract_stats(slides):
+    """
+    Find headline counts in the text of all slides in one regex pass.
+    slides is the data.json list; both languages are scanned.
+    Returns {stat key: count}, the most often stated value per stat.
+    """
+    lines, owners = [], []
+    for index, slide in enumerate(slides):
+        for lang, text in slide.get('content', {}).items():
+            for line in (text or '').split('\n'):
+                if line.strip():
+                    lines.append(line.strip())
+                    owners.append((index, lang))
+
+    # One corpus, one scan; match offsets are mapped back to lines by bisection
+    corpus = '\n'.join(lines)
+    starts = []
+    offset = 0
+    for line in lines:
+        starts.append(offset)
+        offset += len(line) + 1
+
+    repeats = Counter((owners[i], FIGURE.sub('#', line)) for i, line in enumerate(lines))
+
+    found = {}
+    for match in FIGURE.finditer(corpus):
+        if not (match['prefix'] or match['suffix']):
+            continue
+        i = bisect_right(starts, match.start()) - 1
+        line = lines[i]
+        if repeats[(owners[i], FIGURE.sub('#', line))] >= LIST_REPEAT:
+            continue
+
+        clause = clause_at(line, match.start() - starts[i], match.end() - starts[i])
+        key = classify(FIGURE.sub(' ', clause))
+        # "Members : 12000+" takes its platform from the label line above it
+        back = i - 1
+        while key is None and back >= max(0, i - LOOKBACK_LINES) and owners[back] == owners[i]:
+            key = classify(lines[back])
+            back -= 1
+
+        if key:
+            found.setdefault(key, []).append(to_count(match))
+
+    # Most frequently stated value; ties go to the larger figure
+    return {key: max(Counter(values).items(), key=lambda kv: (kv[1], kv[0]))[0]
+            for key, values in found.items()}
+
+def stats_section(slides, defaults):
+    """
+    The about.stats list: every default entry whose figure was found in the
+    slides gets the extracted value; the rest keep their default.
+    defaults is a list of {"key", "value", "label"}.
+    """
+    counts = extract_stats(slides)
+    return [{
+        "value": format_count(counts[d['key']]) if d['key'] in counts else d['value'],
+        "label": d['label']
+    } for d in defaults]
+
+def main():
+    with open('portal/data.json', 'r', encoding='utf-8') as f:
+        slides = json.load(f)
+    counts = extract_stats(slides)
+    for key, spec in STATS.items():
+        value = format_count(counts[key]) if key in counts else "(not found)"
+        print(f"{spec['label']['en']:<20} {value}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+import os
+import re
+import sys
+import json
+import hashlib
+import argparse
+from pathlib import Path
+
+try:
+    from fontTools import subset as ft_subset
+    from fontTools.ttLib import TTFont
+except ImportError:
+    ft_subset = None
+
+try:
+    import brotli  # needed by fontTools for WOFF2
+except ImportError:
+    brotli = None
+
+# Configuration
+BASE_DIR = Path(os.getcwd())
+PORTAL_DIR = BASE_DIR / "portal"
+FONTS_SRC = BASE_DIR / "fonts"
+FONTS_OUT = PORTAL_DIR / "assets/fonts"
+FONTS_CSS = PORTAL_DIR / "fonts.css"
+MANIFEST_FILE = FONTS_OUT / "manifest.json"
+
+# Bump to force a re-subset when the options below change
+SUBSET_VERSION = 1
+
+# family, weight, source file under fonts/ (the weights index.html asks Google for).
+# Both families are OFL: Inter from https://github.com/rsms/inter/releases,
+# Noto Sans SC (OTF) from https://github.com/notofonts/noto-cjk/releases
+FACES = [
+    ("Inter", 300, "Inter-Light.ttf"),
+    ("Inter", 400, "Inter-Regular.ttf"),
+    ("Inter", 600, "Inter-SemiBold.ttf"),
+    ("Inter", 800, "Inter-ExtraBold.ttf"),
+    ("Noto Sans SC", 300, "NotoSansSC-Light.otf"),
+    ("Noto Sans SC", 400, "NotoSansSC-Regular.otf"),
+    ("Noto Sans SC", 700, "NotoSansSC-Bold.otf"),
+]
+
+# Everything the page can display: static HTML, UI strings in app.js, and all content
+TEXT_SOURCES = ["index.html", "app.js", "site_content.json", "search/*.json"]
+
+# Printable ASCII is always kept, e.g. for what users type into the search box
+BASE_CHARS = {chr(c) for c in range(0x20, 0x7f)}
+
+GOOGLE_FONTS_LINK = re.compile(r'<link[^>]+href="https://fonts\.googleapis\.com/[^"]*"[^>]*>')
+
+def json_strings(obj, out):
+    if isinstance(obj, str):
+        out.append(obj)
+    elif isinstance(obj, dict):
+        for value in obj.values():
+            json_strings(value, out)
+    elif isinstance(obj, list):
+        for value in obj:
+            json_strings(value, out)
+    return out
+
+def collect_charset(root=PORTAL_DIR):
+    """Every character that can appear on the rendered page."""
+    chars = set(BASE_CHARS)
+    for pattern in TEXT_SOURCES:
+        for path in sorted(root.glob(pattern)):
+            with open(path, 'r', encoding='utf-8') as f:
+                if path.suffix == '.json':
+                    text = ''.join(json_strings(json.load(f), []))
+                else:
+                    text = f.read()
+            chars.update(c for c in text if c.isprintable())
+    return chars
+
+def unicode_range(codepoints):
+    """Compact CSS unicode-range for a set of code points, e.g. U+20-7E, U+4E00."""
+    ranges = []
+    for cp in sorted(codepoints):
+        if ranges and cp == ranges[-1][1] + 1:
+            ranges[-1][1] = cp
+        else:
+            ranges.append([cp, cp])
+    return ', '.join(f"U+{a:X}" if a == b else f"U+{a:X}-{b:X}" for a, b in ranges)
+
+def file_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.md5(f.read()).hexdigest()
+
+def subset_face(src, dest, codepoints, flavor):
+    """Write the glyphs of src needed for codepoints to dest. Returns the code points src covers."""
+    with TTFont(src) as font:
+        covered = set(font.getBestCmap()) & codepoints
+
+    options = ft_subset.Options()
+    options.flavor = flavor
+    font = ft_subset.load_font(src, options)
+    subsetter = ft_subset.Subsetter(options)
+    subsetter.populate(unicodes=covered)
+    subsetter.subset(font)
+    ft_subset.save_font(font, dest, options)
+    font.close()
+    return covered
+
+def font_face(family, weight, url, flavor, covered):
+    return (
+        "@font-face {\n"
+        f"    font-family: '{family}';\n"
+        "    font-style: normal;\n"
+        f"    font-weight: {weight};\n"
+        "    font-display: swap;\n"
+        f"    src: url('{url}') format('{flavor}');\n"
+        f"    unicode-range: {unicode_range(covered)};\n"
+        "}\n"
+    )
+
+def load_manifest():
+    try:
+        with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def subset_fonts(root=PORTAL_DIR, allow_google_fonts=False):
+    """
+    Subset the local fonts to the characters the site uses and write fonts.css.
+    Skipped when neither the character set nor the source fonts changed.
+    Every face in FACES is required; without fontTools or a source font this
+    is an error, unless allow_google_fonts keeps the site on Google Fonts.
+    Returns True if fonts.css is available.
+    """
+    level = "Note" if allow_google_fonts else "Error"
+    if ft_subset is None:
+        print(f"{level}: fontTools is not installed (pip install fonttools brotli); "
+              "the site would keep loading Google Fonts")
+        return allow_google_fonts and FONTS_CSS.exists()
+
+    missing = [name for _, _, name in FACES if not (FONTS_SRC / name).exists()]
+    if missing:
+        print(f"{level}: missing font files in {FONTS_SRC} (see FACES for where to get them): "
+              f"{', '.join(missing)}; the site would keep loading Google Fonts")
+        return False
+    faces = [(family, weight, FONTS_SRC / name) for family, weight, name in FACES]
+
+    flavor = 'woff2' if brotli else 'woff'
+    chars = collect_charset(root)
+    codepoints = {ord(c) for c in chars}
+
+    key = hashlib.md5(json.dumps({
+        "version": SUBSET_VERSION,
+        "flavor": flavor,
+        "chars": ''.join(sorted(chars)),
+        "fonts": {str(src.name): file_hash(src) for _, _, src in faces}
+    }, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+    manifest = load_manifest()
+    if manifest.get('key') == key and FONTS_CSS.exists() and all((FONTS_OUT / f).exists() for f in manifest.get('files', [])):
+        print(f"Fonts up to date ({len(chars)} characters)")
+        return True
+
+    os.makedirs(FONTS_OUT, exist_ok=True)
+    css = []
+    files = []
+    for family, weight, src in faces:
+        name = f"{src.stem}-{key[:8]}.{flavor}"
+        covered = subset_face(src, FONTS_OUT / name, codepoints, flavor)
+        css.append(font_face(family, weight, f"assets/fonts/{name}", flavor, covered))
+        files.append(name)
+        print(f"{src.name}: {src.stat().st_size / 1024:.0f} KB -> {name}: "
+              f"{(FONTS_OUT / name).stat().st_size / 1024:.1f} KB ({len(covered)} glyphs)")
+
+    # Subsets from an earlier character set
+    for old in FONTS_OUT.iterdir():
+        if old.name not in files and old.name != MANIFEST_FILE.name:
+            old.unlink()
+
+    with open(FONTS_CSS, 'w', encoding='utf-8') as f:
+        f.write("/* Generated by subset_fonts.py from the page text; do not edit */\n")
+        f.write('\n'.join(css))
+    with open(MANIFEST_FILE, 'w', encoding='utf-8') as f:
+        json.dump({"key": key, "files": files}, f, indent=2)
+
+    print(f"Wrote {FONTS_CSS} for {len(chars)} characters")
+    return True
+
+def use_local_fonts(site_dir):
+    """Point a site's index.html at its fonts.css instead of Google Fonts, if it has one."""
+    index = site_dir / "index.html"
+    if not (site_dir / "fonts.css").exists() or not index.exists():
+        return False
+    with open(index, 'r', encoding='utf-8') as f:
+        html = f.read()
+    html, count = GOOGLE_FONTS_LINK.subn('<link rel="stylesheet" href="fonts.css">', html)
+    if count:
+        with open(index, 'w', encoding='utf-8') as f:
+            f.write(html)
+    return bool(count)
+
+def loads_google_fonts(site_dir):
+    """Whether a site's index.html still links Google Fonts."""
+    index = site_dir / "index.html"
+    return index.exists() and bool(GOOGLE_FONTS_LINK.search(index.read_text(encoding='utf-8')))
+
+def main():
+    parser = argparse.ArgumentParser(description="Subset the self-hosted fonts to the characters the portal uses")
+    parser.add_argument('--allow-google-fonts', action='store_true',
+                        help="do not fail when fontTools or the font files are missing")
+    args = parser.parse_args()
+    if not subset_fonts(allow_google_fonts=args.allow_google_fonts) and not args.allow_google_fonts:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+import io
+from PIL import Image
+from build_site import optimize_image
+
+def save_png(path, img):
+    img.save(path, 'PNG')
+    return path
+
+def test_transparent_png_keeps_alpha(tmp_path):
+    # Opaque logo on a transparent background, like the slide icons
+    img = Image.new('RGBA', (64, 64), (0, 0, 0, 0))
+    img.paste((88, 101, 242, 255), (16, 16, 48, 48))
+    src = save_png(tmp_path / "icon.png", img)
+
+    name, encoded, meta = optimize_image(src, "icon")
+
+    out = Image.open(io.BytesIO(encoded)).convert('RGBA')
+    assert name == "icon.png" and meta['format'] == 'PNG'
+    assert out.getpixel((0, 0))[3] == 0
+    assert out.getpixel((32, 32)) == (88, 101, 242, 255)
+
+def test_opaque_rgba_is_flattened(tmp_path):
+    img = Image.new('RGBA', (64, 64), (200, 30, 30, 255))
+    src = save_png(tmp_path / "opaque.png", img)
+
+    _, encoded, _ = optimize_image(src, "opaque")
+
+    assert Image.open(io.BytesIO(encoded)).mode in ('RGB', 'P', 'L')
+    assert 'transparency' not in Image.open(io.BytesIO(encoded)).info
@@ -0,0 +1,143 @@
+import os
+import re
+import json
+import hashlib
+from pathlib import Path
+
+# Configuration
+BASE_DIR = Path(os.getcwd())
+CACHE_FILE = BASE_DIR / ".cache/texts.json"
+TEXT_ROOTS = [BASE_DIR / "extracted_cn", BASE_DIR / "extracted_en", BASE_DIR / "website_data_named"]
+
+# Bump when the parsed structure changes so cached entries are re-parsed
+NORMALIZE_VERSION = 1
+
+# "--- Text Block 1 ---" / "--- 文本块 1 ---" separators written by older extractions
+BLOCK_MARKER = re.compile(r'^---\s*(?:Text Block|文本块)\s*\d+\s*---$')
+URL = re.compile(r'(?:https?://|(?<![\w.])(?:discord\.gg|t\.me)/)[^\s，。、]+', re.IGNORECASE)
+HANDLE = re.compile(r'(?<![\w./@])@[A-Za-z0-9_]{2,}')
+NUMBER = re.compile(r'\d[\d,]*(?:\.\d+)?')
+
+_cache = None
+_dirty = False
+
+def split_lines(text):
+    """Non-empty, stripped lines of a text."""
+    if not text:
+        return []
+    return [line.strip() for line in text.split('\n') if line.strip()]
+
+def parse_text(raw):
+    """
+    Parse raw slide text into the canonical structure every stage uses:
+    blocks (one per text box), lines, URLs, @handles and numbers.
+    "text" is the blocks joined by blank lines, with extraction markers removed.
+    """
+    blocks, current = [], []
+    for line in raw.replace('\r\n', '\n').split('\n'):
+        line = line.rstrip()
+        if BLOCK_MARKER.match(line.strip()) or not line.strip():
+            if current:
+                blocks.append('\n'.join(current))
+                current = []
+            continue
+        current.append(line)
+    if current:
+        blocks.append('\n'.join(current))
+
+    text = '\n\n'.join(blocks).strip()
+    return {
+        "text": text,
+        "blocks": blocks,
+        "lines": split_lines(text),
+        "urls": URL.findall(text),
+        "handles": HANDLE.findall(text),
+        "numbers": NUMBER.findall(text)
+    }
+
+def _load_cache():
+    global _cache
+    if _cache is None:
+        _cache = {}
+        if CACHE_FILE.exists():
+            try:
+                with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+                    _cache = json.load(f)
+            except Exception:
+                _cache = {}
+    return _cache
+
+def load_text(path):
+    """
+    Normalized form of a texts/*.txt file, or None if it does not exist.
+    Parsed once per distinct file content; results are cached on disk by hash.
+    """
+    global _dirty
+    path = Path(path)
+    if not path.exists():
+        return None
+
+    raw = path.read_bytes()
+    digest = f"{NORMALIZE_VERSION}:{hashlib.sha1(raw).hexdigest()}"
+
+    cache = _load_cache()
+    key = str(path.resolve().relative_to(BASE_DIR)) if path.resolve().is_relative_to(BASE_DIR) else str(path.resolve())
+    entry = cache.get(key)
+    if entry and entry['hash'] == digest:
+        return entry['doc']
+
+    doc = parse_text(raw.decode('utf-8', errors='replace'))
+    cache[key] = {"hash": digest, "doc": doc}
+    _dirty = True
+    return doc
+
+def slide_text(slide_dir, lang):
+    """
+    Normalized text of one slide folder: texts/<lang>.txt, falling back to
+    any .txt in texts/ when the file was saved under another name.
+    """
+    texts_dir = Path(slide_dir) / "texts"
+    path = texts_dir / f"{lang}.txt"
+    if not path.exists() and texts_dir.exists():
+        txts = sorted(texts_dir.glob("*.txt"))
+        if txts:
+            path = txts[0]
+    return load_text(path)
+
+def configure(cache_dir, base_dir):
+    """
+    Keep the cache in cache_dir/texts.json, keyed by paths relative to
+    base_dir. Pending entries of the previous cache are saved first.
+    """
+    global BASE_DIR, CACHE_FILE, _cache
+    cache_file = Path(cache_dir) / "texts.json"
+    if cache_file != CACHE_FILE or Path(base_dir) != BASE_DIR:
+        save_cache()
+        BASE_DIR, CACHE_FILE, _cache = Path(base_dir), cache_file, None
+
+def save_cache():
+    """Persist newly parsed entries to CACHE_FILE."""
+    global _dirty
+    if not _dirty:
+        return
+    CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(CACHE_FILE, 'w', encoding='utf-8') as f:
+        json.dump(_cache, f, ensure_ascii=False)
+    _dirty = False
+
+def normalize_all(roots=TEXT_ROOTS):
+    """Parse every texts/*.txt under roots into the cache. Returns {path: doc}."""
+    docs = {}
+    for root in roots:
+        if root.exists():
+            for path in sorted(root.glob("*/texts/*.txt")):
+                docs[str(path.relative_to(BASE_DIR))] = load_text(path)
+    save_cache()
+    return docs
+
+def main():
+    docs = normalize_all()
+    print(f"Normalized {len(docs)} text files into {CACHE_FILE}")
+
+if __name__ == "__main__":
+    main()
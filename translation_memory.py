@@ -0,0 +1,231 @@
+import os
+import re
+import json
+import argparse
+import importlib
+import unicodedata
+from pathlib import Path
+from text_normalize import slide_text, save_cache
+
+# Configuration
+BASE_DIR = Path(os.getcwd())
+SOURCE_CN = BASE_DIR / "extracted_cn"
+SOURCE_EN = BASE_DIR / "extracted_en"
+MEMORY_FILE = BASE_DIR / ".cache/translation_memory.json"
+
+# Two slides are the same slide in the other deck if this share of the
+# smaller one's anchor tokens (Latin words, numbers, handles) appear in both
+MIN_SLIDE_OVERLAP = 0.3
+
+# English length / Chinese length of a plausible pair; rejects a heading
+# paired with the paragraph under a different heading
+LENGTH_RATIO = (0.3, 6.0)
+
+CJK = re.compile(r'[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]')
+ANCHOR = re.compile(r'@?[a-z][a-z0-9_.]{2,}|\d[\d,.]*')
+
+_memory = None
+_dirty = False
+
+def stub_translator(text):
+    """
+    Default translator: text without Chinese is already usable as English;
+    anything else has no translation. Replace with set_translator().
+    """
+    return None if CJK.search(text) else text
+
+translator = stub_translator
+
+def set_translator(fn):
+    """Use fn(cn_text) -> en_text or None for text the memory has no entry for."""
+    global translator
+    translator = fn
+
+def load_translator(spec):
+    """Resolve a 'module:function' spec, e.g. 'my_mt:translate'."""
+    module, _, name = spec.partition(':')
+    return getattr(importlib.import_module(module), name or 'translate')
+
+def normalize(text):
+    """Memory key: NFKC (full-width punctuation -> ASCII), no whitespace, lowercase."""
+    return ''.join(unicodedata.normalize('NFKC', text).split()).lower()
+
+def anchors(text):
+    """Tokens that survive translation: Latin words, numbers, @handles."""
+    return {t.replace(',', '') for t in ANCHOR.findall(unicodedata.normalize('NFKC', text).lower())}
+
+def slide_ids(source):
+    if not source.exists():
+        return []
+    return sorted(d.name for d in source.iterdir() if d.is_dir() and d.name.startswith('slide_'))
+
+def align_slides(source_cn=None, source_en=None):
+    """
+    Pair CN slides with EN slides. The decks do not line up by number (slides
+    were added and dropped), so this is a monotonic alignment maximising the
+    overlap of anchor tokens. Returns {cn slide id: en slide id}.
+    """
+    source_cn, source_en = source_cn or SOURCE_CN, source_en or SOURCE_EN
+    cn = [(sid, slide_text(source_cn / sid, "cn")) for sid in slide_ids(source_cn)]
+    en = [(sid, slide_text(source_en / sid, "en")) for sid in slide_ids(source_en)]
+    cn_anchors = [anchors(doc['text']) if doc else set() for _, doc in cn]
+    en_anchors = [anchors(doc['text']) if doc else set() for _, doc in en]
+
+    def similarity(a, b):
+        if not a or not b:
+            return 0.0
+        overlap = len(a & b) / min(len(a), len(b))
+        return overlap if overlap >= MIN_SLIDE_OVERLAP else 0.0
+
+    # score[i][j]: best total similarity aligning cn[i:] with en[j:]
+    rows, cols = len(cn), len(en)
+    score = [[0.0] * (cols + 1) for _ in range(rows + 1)]
+    for i in range(rows - 1, -1, -1):
+        for j in range(cols - 1, -1, -1):
+            score[i][j] = max(score[i + 1][j], score[i][j + 1],
+                              similarity(cn_anchors[i], en_anchors[j]) + score[i + 1][j + 1])
+
+    pairs = {}
+    i = j = 0
+    while i < rows and j < cols:
+        sim = similarity(cn_anchors[i], en_anchors[j])
+        if sim and score[i][j] == sim + score[i + 1][j + 1]:
+            pairs[cn[i][0]] = en[j][0]
+            i += 1
+            j += 1
+        elif score[i][j] == score[i + 1][j]:
+            i += 1
+        else:
+            j += 1
+    return pairs
+
+def block_pairs(cn_blocks, en_blocks):
+    """
+    Translation pairs from one aligned slide: blocks present verbatim in both
+    decks (names, headings) are anchors, and the Chinese block that follows an
+    anchor translates the English block that follows the same anchor.
+    """
+    en_keys = [normalize(b) for b in en_blocks]
+    shared = set(normalize(b) for b in cn_blocks) & set(en_keys)
+
+    pairs = []
+    for i, block in enumerate(cn_blocks[:-1]):
+        key = normalize(block)
+        if key not in shared:
+            continue
+        j = en_keys.index(key)
+        source, target = cn_blocks[i + 1], en_blocks[j + 1] if j + 1 < len(en_blocks) else None
+        if (target and normalize(source) not in shared and normalize(target) not in shared
+                and CJK.search(source) and not CJK.search(target)
+                and LENGTH_RATIO[0] <= len(target) / len(source) <= LENGTH_RATIO[1]):
+            pairs.append((source, target))
+    return pairs
+
+def _load_memory():
+    """The memory from MEMORY_FILE ({} if there is none); never aligns the decks."""
+    global _memory
+    if _memory is None:
+        try:
+            with open(MEMORY_FILE, 'r', encoding='utf-8') as f:
+                _memory = json.load(f)
+        except Exception:
+            _memory = {}
+    return _memory
+
+def ensure_memory():
+    """
+    For callers that only translate (update_team.py): on the first run, when
+    there is no memory file yet, collect the deck pairs so lookups work
+    straight away. build_site.py rebuilds the memory itself every build.
+    """
+    if _memory is None and not MEMORY_FILE.exists():
+        build_memory()
+    return _load_memory()
+
+def build_memory(source_cn=None, source_en=None):
+    """
+    (Re)collect the deck pairs into the memory. Entries that came from the
+    translator are kept; deck entries are replaced so edits to the decks win.
+    Returns (slide alignment, number of deck pairs).
+    """
+    global _dirty
+    source_cn, source_en = source_cn or SOURCE_CN, source_en or SOURCE_EN
+    memory = _load_memory()
+    for key in [k for k, v in memory.items() if v['origin'] == 'deck']:
+        del memory[key]
+
+    alignment = align_slides(source_cn, source_en)
+    count = 0
+    for cn_id, en_id in alignment.items():
+        cn_doc = slide_text(source_cn / cn_id, "cn")
+        en_doc = slide_text(source_en / en_id, "en")
+        for source, target in block_pairs(cn_doc['blocks'], en_doc['blocks']):
+            memory[normalize(source)] = {"cn": source, "en": target, "origin": "deck"}
+            count += 1
+
+    _dirty = True
+    return alignment, count
+
+def translate(text):
+    """English for text: memory first, then the translator (result remembered). None if neither has one."""
+    global _dirty
+    if not text:
+        return text
+    memory = _load_memory()
+    key = normalize(text)
+    if key in memory:
+        return memory[key]['en']
+
+    result = translator(text)
+    if result and translator is not stub_translator:
+        memory[key] = {"cn": text, "en": result, "origin": "translator"}
+        _dirty = True
+    return result
+
+def translate_blocks(blocks):
+    """English text for a slide that only exists in the CN deck; untranslatable blocks are left out."""
+    return '\n\n'.join(filter(None, (translate(b) for b in blocks)))
+
+def configure(cache_dir, source_cn, source_en):
+    """
+    Keep the memory in cache_dir/translation_memory.json and seed it from
+    these decks. Pending entries of the previous memory are saved first.
+    """
+    global SOURCE_CN, SOURCE_EN, MEMORY_FILE, _memory
+    SOURCE_CN, SOURCE_EN = Path(source_cn), Path(source_en)
+    memory_file = Path(cache_dir) / "translation_memory.json"
+    if memory_file != MEMORY_FILE:
+        save_memory()
+        MEMORY_FILE, _memory = memory_file, None
+
+def save_memory():
+    """Persist the memory to MEMORY_FILE."""
+    global _dirty
+    if not _dirty:
+        return
+    MEMORY_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(MEMORY_FILE, 'w', encoding='utf-8') as f:
+        json.dump(_memory, f, ensure_ascii=False, indent=1)
+    _dirty = False
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the CN->EN translation memory from the two decks")
+    parser.add_argument('--translator', help="module:function used for text the decks do not cover")
+    parser.add_argument('lookup', nargs='*', help="Chinese text to translate")
+    args = parser.parse_args()
+
+    if args.translator:
+        set_translator(load_translator(args.translator))
+
+    alignment, count = build_memory()
+    print(f"Aligned {len(alignment)} slides, {count} translation pairs")
+    for cn_id, en_id in alignment.items():
+        print(f"  {cn_id} -> {en_id}")
+    for text in args.lookup:
+        print(f"{text} -> {translate(text)}")
+
+    save_memory()
+    save_cache()
+
+if __name__ == "__main__":
+    main()
@@ -1,176 +1,223 @@
 import os
 import json
 import shutil
+import hashlib
+import argparse
 from pathlib import Path
+from dataclasses import dataclass
 from PIL import Image
+from image_ops import placeholder, prescale
+from paginate_content import write_pages
+from search_index import write_index
+from translation_memory import save_memory
+import text_normalize
+import translation_memory
+from content_merge import load_roster, team_section, apply_sections, TEAM_ASSETS
 
-# Configuration
-BASE_DIR = Path(os.getcwd())
-SOURCE_IMG_DIR = BASE_DIR / "images/kol"
-DEST_IMG_DIR = BASE_DIR / "portal/assets/images/kol"
-DATA_FILE = BASE_DIR / "portal/site_content.json"
-
-# Ensure dest dir exists
-if os.path.exists(DEST_IMG_DIR):
-    shutil.rmtree(DEST_IMG_DIR)
-os.makedirs(DEST_IMG_DIR, exist_ok=True)
-
-# Team Data
-team_list = [
-    {
-        "name": "刘社长.eth",
-        "desc": "3amClub创始人，操盘上百款app流量数据深耕Gamefi赛道，专注链游项目及投研",
-        "twitter": "https://x.com/liushezhang",
-        "followers": "70K+",
-        "icon_name": "liushezhang.png"
-    },
-    {
-        "name": "暴躁的希爷丶",
-        "desc": "Bayc持有者，投资人，创业者，web3工作室创始人，专注最新项目机会。",
-        "twitter": "https://x.com/yaking168",
-        "followers": "57K+",
-        "icon_name": "yaking168.png"
-    },
-    {
-        "name": "sanyi.eth",
-        "desc": "Web3 KOL，多个Web3项目的大使、推动者，互联网大厂运营管理",
-        "twitter": "https://x.com/sanyi_eth_",
-        "followers": "25.8K+",
-        "icon_name": "sanyi.png"
-    },
-    {
-        "name": "Calman",
-        "desc": "Web3探寻者，专注于Web3项目用户增长；社区建设、品牌塑造",
-        "twitter": "https://x.com/Calman16910515",
-        "followers": "75K+",
-        "icon_name": "Calman.png"
-    },
-    {
-        "name": "超级罗杰斯",
-        "desc": "15年+类金融行业投资者，8年+币圈交易员拥有成熟的投资和量化交易团队",
-        "twitter": "https://x.com/superogers1",
-        "followers": "28K+",
-        "icon_name": "superogers1.png"
-    },
-    {
-        "name": "雪球",
-        "desc": "链游领域专家，深耕链游赛道，专注链游早期项目投研及增长运营。",
-        "twitter": "https://x.com/xueqiu88",
-        "followers": "90K+",
-        "icon_name": "xueqiu88.jpg"
-    },
-    {
-        "name": "磊哥",
-        "desc": "3am Club技术总监  日本某大型交易平台技术专家,专注空投，NFT方向",
-        "twitter": "https://x.com/zlexdl",
-        "followers": "86K+",
-        "icon_name": "zlexdl.png"
-    },
-    {
-        "name": "lilili.eth",
-        "desc": "资深社交媒体影响者，NFT早期发倔与扶持，擅长增加项目品牌影响力",
-        "twitter": "https://x.com/dashutiaozi",
-        "followers": "119K+",
-        "icon_name": "dashutiaozi.jpg"
-    },
-    {
-        "name": "charles",
-        "desc": "专注defi类项目，隐私，应用等赛道，撸毛交互狂热者",
-        "twitter": "https://x.com/charles48011843",
-        "followers": "117K+",
-        "icon_name": "charles48011843.png"
-    },
-    {
-        "name": "捡个大西瓜",
-        "desc": "千万英语学习app联合创始人，基金定投研究者，目前专注社区建设与新项目挖掘，以及定投在区块链投资的应用。",
-        "twitter": "https://x.com/Uncle_Simon25",
-        "followers": "17K+",
-        "icon_name": "Uncle_Simon25.png"
-    },
-    {
-        "name": "大树",
-        "desc": "3am Club艺术总监、官推负责人，互联网公司品牌设计负责人。NFT创作 / 收藏 / 投研",
-        "twitter": "https://x.com/ultree_",
-        "followers": "17K+",
-        "icon_name": "ultree_.png"
-    },
-    {
-        "name": "Rick",
-        "desc": "3am Club商务负责人 律师lawyer Web3法律服务提供者",
-        "twitter": "https://x.com/xiaoxiaozhangsm",
-        "followers": "17K+",
-        "icon_name": "xiaoxiaozhangsm.png"
-    },
-    {
-        "name": "Oeuia",
-        "desc": "3am club商务经理，专注于Web3空&NFT&Gamefi，发掘早期优质项目",
-        "twitter": "https://x.com/oeuia_eth",
-        "followers": "7K+",
-        "icon_name": "oeuia_eth.png"
-    }
-]
-
-def process_images():
-    print(f"Source Directory: {SOURCE_IMG_DIR}")
+# Largest edge of a published avatar; team cards show them at ~250-300px
+AVATAR_SIZE = 300
+
+@dataclass
+class TeamConfig:
+    """
+    Roster, avatar source and outputs for one update. Paths default to the
+    usual layout under base_dir (the working directory when created),
+    including the avatar manifest and the text and translation caches in cache_dir.
+    """
+    base_dir: Path = None
+    roster_file: Path = None
+    source_img_dir: Path = None
+    portal_dir: Path = None
+    cache_dir: Path = None
+    avatar_size: int = AVATAR_SIZE
+
+    def __post_init__(self):
+        self.base_dir = Path(self.base_dir or os.getcwd())
+        self.roster_file = Path(self.roster_file or self.base_dir / "data/team.json")
+        self.source_img_dir = Path(self.source_img_dir or self.base_dir / "images/kol")
+        self.portal_dir = Path(self.portal_dir or self.base_dir / "portal")
+        self.cache_dir = Path(self.cache_dir or self.base_dir / ".cache")
+
+    @property
+    def dest_img_dir(self):
+        return self.portal_dir / "assets/images/kol"
+
+    @property
+    def manifest_file(self):
+        # Build state, kept out of the published tree
+        return self.cache_dir / "avatars.json"
+
+    @property
+    def data_file(self):
+        return self.portal_dir / "site_content.json"
+
+    def use_caches(self):
+        """Point the text and translation caches (used to fill missing English) at this config."""
+        text_normalize.configure(self.cache_dir, self.base_dir)
+        translation_memory.configure(self.cache_dir, self.base_dir / "extracted_cn", self.base_dir / "extracted_en")
+        translation_memory.ensure_memory()
+
+def file_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+def load_manifest(path):
+    if path.exists():
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception:
+            pass
+    return {}
+
+def sync_avatar(src_path, dest_path, size=AVATAR_SIZE):
+    """
+    Publish one avatar. Files already at display size in the right format are
+    byte-copied; anything larger is downscaled and re-encoded.
+    Returns (image metadata, action).
+    """
+    with Image.open(src_path) as img:
+        save_format = 'JPEG' if dest_path.suffix.lower() in ('.jpg', '.jpeg') else 'PNG'
+
+        if max(img.size) <= size and img.format == save_format:
+            shutil.copyfile(src_path, dest_path)
+            action = "Copied"
+        else:
+            if max(img.size) > size:
+                img = prescale(img, size / max(img.size))
+                img.thumbnail((size, size), Image.Resampling.LANCZOS)
+            if save_format == 'JPEG':
+                if img.mode != 'RGB':
+                    img = img.convert('RGB')
+                img.save(dest_path, save_format, quality=90, optimize=True)
+            else:
+                img.save(dest_path, save_format, optimize=True)
+            action = "Resized"
+
+        meta = placeholder(img)
+        meta.update({
+            "width": img.width,
+            "height": img.height,
+            "bytes": dest_path.stat().st_size,
+            "format": save_format
+        })
+    return meta, action
+
+def process_images(roster, config):
+    print(f"Source Directory: {config.source_img_dir}")
     
-    if not SOURCE_IMG_DIR.exists():
-        print(f"Error: Source directory {SOURCE_IMG_DIR} does not exist!")
-        return
+    if not config.source_img_dir.exists():
+        print(f"Error: Source directory {config.source_img_dir} does not exist!")
+        return {}
 
-    for member in team_list:
+    os.makedirs(config.dest_img_dir, exist_ok=True)
+    # Earlier versions kept the manifest beside the avatars; it is swept below
+    manifest = load_manifest(config.manifest_file) or load_manifest(config.dest_img_dir / "manifest.json")
+    new_manifest = {}
+
+    images = {}
+
+    def keep_published(icon_name, dest_path):
+        """Keep serving the avatar published by an earlier run when this run cannot sync it."""
+        cached = manifest.get(icon_name)
+        if cached and dest_path.exists():
+            new_manifest[icon_name] = cached
+            images[icon_name] = (f"assets/images/kol/{icon_name}", cached['meta'])
+            print(f"Kept previous: {icon_name}")
+
+    for member in roster:
         icon_name = member['icon_name']
-        src_path = SOURCE_IMG_DIR / icon_name
+        src_path = config.source_img_dir / icon_name
+        dest_path = config.dest_img_dir / icon_name
         
         if not src_path.exists():
              print(f"Warning: Source image not found: {src_path}")
+             keep_published(icon_name, dest_path)
              continue
-             
-        dest_path = DEST_IMG_DIR / icon_name
         
         try:
-            with Image.open(src_path) as img:
-                if icon_name.lower().endswith(('.jpg', '.jpeg')):
-                    if img.mode != 'RGB':
-                        img = img.convert('RGB')
-                    img.save(dest_path, 'JPEG', quality=90)
-                else:
-                    img.save(dest_path, 'PNG')
-            
-            member['image'] = f"assets/images/kol/{icon_name}"
-            print(f"Synced: {icon_name}")
+            src_hash = file_hash(src_path)
+            cached = manifest.get(icon_name)
+
+            # Skip avatars whose source and settings are unchanged since the last sync
+            if cached and cached['src_hash'] == src_hash and cached['size'] == config.avatar_size and dest_path.exists():
+                meta = cached['meta']
+                action = "Unchanged"
+            else:
+                meta, action = sync_avatar(src_path, dest_path, config.avatar_size)
+
+            new_manifest[icon_name] = {"src_hash": src_hash, "size": config.avatar_size, "meta": meta}
+            images[icon_name] = (f"assets/images/kol/{icon_name}", meta)
+            print(f"{action}: {icon_name}")
             
         except Exception as e:
             print(f"Error processing {icon_name}: {e}")
+            keep_published(icon_name, dest_path)
+
+    # Remove only outputs that no team member references any more; a member
+    # whose source is temporarily missing or broken keeps their live avatar
+    members = {member['icon_name'] for member in roster}
+    for path in config.dest_img_dir.iterdir():
+        if path.is_file() and path.name not in members:
+            path.unlink()
+            print(f"Removed orphan: {path.name}")
+
+    config.manifest_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(config.manifest_file, 'w', encoding='utf-8') as f:
+        json.dump(new_manifest, f, ensure_ascii=False, indent=2)
+
+    return images
 
-def update_json():
+def update_json(roster, images, config):
     try:
-        with open(DATA_FILE, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
-        new_team_data = []
-        for m in team_list:
-            new_team_data.append({
-                "name": m['name'],
-                "role": "Core Team",
-                "desc": {
-                    "cn": m['desc'],
-                    "en": m['desc']
-                },
-                "image": m.get('image', ''),
-                "twitter": m['twitter'],
-                "followers": m['followers']
-            })
-            
-        data['team'] = new_team_data
-        
-        with open(DATA_FILE, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-            
-        print("Successfully updated site_content.json")
+        updates = {
+            "team": team_section(roster, {k: path for k, (path, _) in images.items()}),
+            "assets": {path: meta for path, meta in images.values()}
+        }
+        # English descriptions missing from the roster were filled from the translation memory
+        save_memory()
+        # Avatars of members no longer on the roster drop out of 'assets'
+        data, changed = apply_sections(updates, config.data_file, merge=('assets',),
+                                       owns=lambda path: path.startswith(TEAM_ASSETS))
+
+        if not changed:
+            print("site_content.json already up to date")
+            return
+
+        print(f"Successfully updated site_content.json ({', '.join(changed)})")
+
+        write_pages(data, config.portal_dir / "content")
+        write_index(data, search_dir=config.portal_dir / "search", raw_file=config.portal_dir / "data.json")
         
     except Exception as e:
         print(f"Error updating JSON: {e}")
 
+def update_team(config=None):
+    """
+    Publish the roster's avatars and merge the team section into
+    site_content.json. Safe to call repeatedly in one process.
+    Returns False if the roster could not be loaded.
+    """
+    config = config or TeamConfig()
+    config.use_caches()
+    try:
+        roster = load_roster(config.roster_file)
+    except (OSError, ValueError) as e:
+        print(f"Error loading roster: {e}")
+        return False
+
+    images = process_images(roster, config)
+    update_json(roster, images, config)
+    return True
+
+def main():
+    parser = argparse.ArgumentParser(description="Publish team avatars and update the team section of site_content.json")
+    parser.add_argument('--base-dir', type=Path, help="project directory (default: the working directory)")
+    parser.add_argument('--avatar-size', type=int, default=AVATAR_SIZE, help="largest edge of a published avatar")
+    args = parser.parse_args()
+
+    if not update_team(TeamConfig(base_dir=args.base_dir, avatar_size=args.avatar_size)):
+        exit(1)
+
 if __name__ == "__main__":
-    process_images()
-    update_json()
+    main()
@@ -0,0 +1,202 @@
+import os
+import re
+import sys
+import json
+import argparse
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image
+from paginate_content import collect_refs
+
+# Configuration
+BASE_DIR = Path(os.getcwd())
+PORTAL_DIR = BASE_DIR / "portal"
+JSON_OUTPUTS = ["data.json", "site_content.json", "thumbnails.json", "content/*.json"]
+IMAGE_EXTS = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.tiff', '.bmp'}
+
+# Cache manifests live beside the assets they describe but are never served
+IGNORED_NAMES = {'manifest.json'}
+
+# Intermediate outputs: their references are checked, but being listed only
+# there does not keep an asset alive on the published site
+BUILD_ONLY = {'data.json'}
+
+HTML_REF = re.compile(r'''(?:src|href)=["']([^"'#?]+)''')
+CSS_REF = re.compile(r'''url\(\s*["']?([^"')?#]+)''')
+
+def is_local(ref):
+    return '://' not in ref and not ref.startswith(('mailto:', '//', 'data:', '#'))
+
+def html_refs(path):
+    """Local files referenced by src/href attributes in an HTML page."""
+    with open(path, 'r', encoding='utf-8') as f:
+        html = f.read()
+    return {(path.parent / ref).resolve() for ref in HTML_REF.findall(html) if is_local(ref)}
+
+def css_refs(path):
+    """Local files referenced by url(...) in a stylesheet."""
+    with open(path, 'r', encoding='utf-8') as f:
+        css = f.read()
+    return {(path.parent / ref).resolve() for ref in CSS_REF.findall(css) if is_local(ref)}
+
+def json_refs(path, root):
+    """assets/... paths and paged content files referenced by a JSON output."""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    refs = collect_refs(data)
+    if isinstance(data, dict):
+        for info in data.get('paged', {}).values():
+            refs.update(info['pages'])
+    return {(root / ref).resolve() for ref in refs}
+
+def empty_refs(obj, where, found):
+    """Image fields left blank, e.g. a team member whose avatar never synced."""
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            if key in ('image', 'bg_image') and value == '':
+                found.append(f"{where}.{key}")
+            else:
+                empty_refs(value, f"{where}.{key}", found)
+    elif isinstance(obj, list):
+        for i, value in enumerate(obj):
+            empty_refs(value, f"{where}[{i}]", found)
+    return found
+
+def reference_graph(root):
+    """
+    Parse every JSON, HTML and CSS output under root.
+    Returns ({referenced file: set of referrers}, [blank image fields]).
+    """
+    root = root.resolve()
+    graph = {}
+    empty = []
+
+    def add(referrer, targets):
+        for target in targets:
+            graph.setdefault(target, set()).add(str(referrer.relative_to(root)))
+
+    for pattern in JSON_OUTPUTS:
+        for path in sorted(root.glob(pattern)):
+            add(path, json_refs(path, root))
+            with open(path, 'r', encoding='utf-8') as f:
+                empty_refs(json.load(f), str(path.relative_to(root)), empty)
+    for path in sorted(root.rglob('*.html')):
+        add(path, html_refs(path))
+    for path in sorted(root.rglob('*.css')):
+        add(path, css_refs(path))
+
+    return graph, empty
+
+def reachable(root, entries):
+    """
+    Every file reachable from the entry points (paths relative to root) by
+    following references through JSON, HTML and CSS files.
+    """
+    root = root.resolve()
+    graph, _ = reference_graph(root)
+
+    forward = {}
+    for target, referrers in graph.items():
+        for referrer in referrers:
+            forward.setdefault((root / referrer).resolve(), set()).add(target)
+
+    seen = set()
+    stack = [(root / entry).resolve() for entry in entries]
+    while stack:
+        path = stack.pop()
+        if path not in seen:
+            seen.add(path)
+            stack.extend(forward.get(path, ()))
+    return seen
+
+def check_file(path):
+    """Return a problem description for one referenced file, or None."""
+    if not path.exists():
+        return "missing"
+    if path.stat().st_size == 0:
+        return "empty file"
+    if path.suffix.lower() in IMAGE_EXTS:
+        try:
+            with Image.open(path) as img:
+                img.verify()
+        except Exception as e:
+            return f"undecodable ({e})"
+    return None
+
+def verify(root=PORTAL_DIR, workers=8):
+    """
+    Check every referenced file (existence, size, decodability) in a thread
+    pool and list assets nothing references. Returns a report dict.
+    """
+    root = root.resolve()
+    graph, empty = reference_graph(root)
+
+    inside = sorted(p for p in graph if p.is_relative_to(root))
+    outside = sorted(p for p in graph if not p.is_relative_to(root))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        problems = dict(zip(inside, pool.map(check_file, inside)))
+
+    broken = [{
+        "path": str(p.relative_to(root)),
+        "problem": problem,
+        "referenced_by": sorted(graph[p])
+    } for p, problem in problems.items() if problem]
+    broken += [{
+        "path": str(p),
+        "problem": "outside the site root",
+        "referenced_by": sorted(graph[p])
+    } for p in outside]
+
+    assets_dir = root / "assets"
+    orphans = []
+    if assets_dir.exists():
+        for path in sorted(assets_dir.rglob('*')):
+            if path.is_file() and path.name not in IGNORED_NAMES and not (graph.get(path.resolve(), set()) - BUILD_ONLY):
+                orphans.append({"path": str(path.relative_to(root)), "bytes": path.stat().st_size})
+
+    return {
+        "checked": len(inside),
+        "broken": broken,
+        "empty_refs": empty,
+        "orphans": orphans,
+        "orphan_bytes": sum(o['bytes'] for o in orphans)
+    }
+
+def print_report(report):
+    print(f"Checked {report['checked']} referenced files")
+
+    if report['broken']:
+        print(f"\nBroken references ({len(report['broken'])}):")
+        for item in report['broken']:
+            print(f"  - {item['path']}: {item['problem']} (from {', '.join(item['referenced_by'])})")
+
+    if report['empty_refs']:
+        print(f"\nBlank image fields ({len(report['empty_refs'])}):")
+        for where in report['empty_refs']:
+            print(f"  - {where}")
+
+    if report['orphans']:
+        print(f"\nOrphaned assets ({len(report['orphans'])}, {report['orphan_bytes'] / 1024:.1f} KB):")
+        for item in report['orphans']:
+            print(f"  - {item['path']} ({item['bytes'] / 1024:.1f} KB)")
+
+    if not (report['broken'] or report['empty_refs']):
+        print("All references OK")
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify every asset referenced by the portal outputs")
+    parser.add_argument('root', nargs='?', type=Path, default=PORTAL_DIR, help="site directory to check")
+    parser.add_argument('--json', action='store_true', help="print the report as JSON")
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+
+    report = verify(args.root, args.workers)
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print_report(report)
+    sys.exit(1 if report['broken'] else 0)
+
+if __name__ == "__main__":
+    main()